@@ -0,0 +1,96 @@
+""" Benchmark of recovering the signer node of block headers, compared with the hex round trips of the old ec_recover
+It runs offline, the blocks are generated and signed locally in the shape of bub.get_block results.
+Usage: python benchmarks/recover.py [blocks]
+"""
+import os
+import sys
+import time
+
+import rlp
+from bubble.datastructures import AttributeDict
+from eth_account._utils.signing import to_standard_signature_bytes
+from eth_hash.auto import keccak
+from eth_keys import keys
+from eth_keys.datatypes import Signature
+from eth_utils import remove_0x_prefix, to_canonical_address, to_checksum_address
+from hexbytes import HexBytes
+
+from bubble_aide.utils.recover import get_header_data, recover_node_id, recover_headers, PublicKey
+
+
+def make_blocks(count):
+    private_key = keys.PrivateKey(os.urandom(32))
+    blocks = []
+    for number in range(1, count + 1):
+        block = {
+            'parentHash': HexBytes(os.urandom(32)),
+            'miner': to_checksum_address(os.urandom(20)),
+            'stateRoot': HexBytes(os.urandom(32)),
+            'transactionsRoot': HexBytes(os.urandom(32)),
+            'receiptsRoot': HexBytes(os.urandom(32)),
+            'logsBloom': HexBytes(bytes(256)),
+            'number': number,
+            'gasLimit': 4712388,
+            'gasUsed': 0,
+            'timestamp': 1700000000000 + number * 1000,
+            'extraData': HexBytes(os.urandom(32)),
+            'nonce': HexBytes(os.urandom(81)),
+        }
+        header_hash, _ = get_header_data(AttributeDict(block))
+        sign = private_key.sign_msg_hash(header_hash).to_bytes()
+        block['extraData'] = HexBytes(block['extraData'] + sign[:64] + bytes([sign[64] + 27]))
+        blocks.append(AttributeDict(block))
+
+    return blocks, private_key.public_key.to_bytes().hex()
+
+
+def baseline_recover(block):
+    """ The ec_recover before the hex round trips were removed
+    """
+    sign = block.extraData[32:]
+    extra = block.extraData[:32]
+    raw_data = [bytes.fromhex(remove_0x_prefix(block.parentHash.hex())),
+                to_canonical_address(block.miner),
+                bytes.fromhex(remove_0x_prefix(block.stateRoot.hex())),
+                bytes.fromhex(remove_0x_prefix(block.transactionsRoot.hex())),
+                bytes.fromhex(remove_0x_prefix(block.receiptsRoot.hex())),
+                bytes.fromhex(remove_0x_prefix(block.logsBloom.hex())),
+                block.number,
+                block.gasLimit,
+                block.gasUsed,
+                block.timestamp,
+                extra,
+                bytes.fromhex(remove_0x_prefix(block.nonce.hex()))
+                ]
+    hash_bytes = HexBytes(keccak(rlp.encode(raw_data)))
+    signature = Signature(signature_bytes=to_standard_signature_bytes(HexBytes(sign)))
+    return remove_0x_prefix(signature.recover_public_key_from_msg_hash(hash_bytes).to_hex())
+
+
+def current_recover(block):
+    return recover_node_id(*get_header_data(block))
+
+
+def bench(func, blocks, node_id):
+    start = time.perf_counter()
+    results = func(blocks)
+    elapsed = time.perf_counter() - start
+    assert all(result == node_id for result in results), 'recovered a wrong node id'
+    return elapsed
+
+
+def main(count=1000):
+    blocks, node_id = make_blocks(count)
+    cases = {
+        'baseline': lambda blocks: [baseline_recover(block) for block in blocks],
+        'current': lambda blocks: [current_recover(block) for block in blocks],
+        'headers': recover_headers,
+    }
+    print(f'coincurve: {"yes" if PublicKey else "no"}')
+    for name, func in cases.items():
+        elapsed = bench(func, blocks, node_id)
+        print(f'{name:<10} {elapsed:8.3f}s  {count / elapsed:10.1f} blocks/s')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,62 @@
+""" Benchmark of signing bulk transactions in a process pool, compared with signing them one by one
+It runs offline, the transactions are signed but not sent. Usage: python benchmarks/signing.py [count] [accounts]
+"""
+import os
+import sys
+import time
+
+from eth_account import Account
+
+from bubble_aide.utils.signer import ProcessSigner
+
+
+def make_transactions(accounts, count):
+    txns = []
+    for i in range(count):
+        account = accounts[i % len(accounts)]
+        txns.append({
+            'from': account.address,
+            'to': '0x1000000000000000000000000000000000000002',
+            'value': 0,
+            'data': '0x' + '00' * 64,
+            'gas': 200000,
+            'gasPrice': 1000000000,
+            'nonce': i // len(accounts),
+            'chainId': 2203181,
+        })
+
+    return txns
+
+
+def bench_sequential(accounts, txns):
+    keys = {account.address: account.key for account in accounts}
+    start = time.perf_counter()
+    for txn in txns:
+        Account.sign_transaction(txn, keys[txn['from']])
+    return time.perf_counter() - start
+
+
+def bench_process(accounts, txns, processes):
+    with ProcessSigner([account.key for account in accounts], processes=processes) as signer:
+        signer.sign_transactions(txns[:processes])  # Start the worker processes before timing
+        start = time.perf_counter()
+        signer.sign_transactions(txns)
+        return time.perf_counter() - start
+
+
+def main(count=2000, account_count=10):
+    accounts = [Account.create() for _ in range(account_count)]
+    txns = make_transactions(accounts, count)
+
+    elapsed = bench_sequential(accounts, txns)
+    print(f'sequential    {elapsed:8.3f}s  {count / elapsed:10.1f} txn/s')
+
+    processes = 1
+    while processes <= os.cpu_count():
+        elapsed = bench_process(accounts, txns, processes)
+        print(f'processes={processes:<3} {elapsed:8.3f}s  {count / elapsed:10.1f} txn/s')
+        processes *= 2
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,92 @@
+""" Benchmark of the startup time of Aide in eager and lazy mode
+It runs offline against a local json-rpc stub, which answers the connection check and the economic config with a fixed latency.
+Usage: python benchmarks/startup.py [rounds] [latency_ms]
+"""
+import json
+import sys
+import threading
+import time
+from dataclasses import fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bubble_aide import Aide
+from bubble_aide.statics.economic import Economic
+
+common_data = {
+    'maxEpochMinutes': 3,
+    'nodeBlockTimeWindow': 10,
+    'perRoundBlocks': 10,
+    'maxConsensusVals': 4,
+    'additionalCycleTime': 525960,
+}
+
+
+def make_economic_config():
+    config = {}
+    for section in fields(Economic):
+        config[section.name] = {field.name: common_data.get(field.name, 1) for field in fields(section.type)}
+    return json.dumps(config)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.02
+    results = {
+        'web3_clientVersion': 'bubble/stub',
+        'debug_economicConfig': make_economic_config(),
+        'bub_chainId': '0x1',
+        'bub_blockNumber': '0x64',
+    }
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        requests = request if type(request) is list else [request]
+        responses = [self.respond(request) for request in requests]
+        body = json.dumps(responses if type(request) is list else responses[0]).encode('utf-8')
+
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond(self, request):
+        response = {'jsonrpc': '2.0', 'id': request['id']}
+        if request['method'] in self.results:
+            response['result'] = self.results[request['method']]
+        else:
+            response['error'] = {'code': -32601, 'message': f'method {request["method"]} is not stubbed'}
+        return response
+
+    def log_message(self, *args):
+        pass
+
+
+def bench(create, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        create()
+    return (time.perf_counter() - start) / rounds
+
+
+def main(rounds=20, latency_ms=20):
+    StubHandler.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    uri = f'http://127.0.0.1:{server.server_port}'
+
+    cases = {
+        'eager': lambda: Aide(uri, economic_cache=None),
+        'lazy': lambda: Aide(uri, lazy=True, economic_cache=None),
+        'lazy + economic': lambda: Aide(uri, lazy=True, economic_cache=None).economic,
+        'lazy + staking': lambda: Aide(uri, lazy=True, economic_cache=None).staking,
+    }
+    try:
+        for name, create in cases.items():
+            print(f'{name:<16} {bench(create, rounds) * 1000:10.2f}ms')
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
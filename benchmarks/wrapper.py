@@ -0,0 +1,85 @@
+""" Benchmark of the per-call overhead of contract_transaction, compared with deriving the account and deep copying txn on each call
+It runs offline, the contract function and aide are stubbed so that only the wrapper is measured.
+Usage: python benchmarks/wrapper.py [calls]
+"""
+import copy
+import functools
+import sys
+import time
+
+from eth_account import Account
+
+from bubble_aide.utils.wrapper import contract_transaction
+
+
+def baseline_transaction(fid=None, default_txn=None):
+    """ The wrapper before accounts were cached and the deepcopy was dropped
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(self, *args, txn: dict = None, private_key=None, **kwargs):
+            txn = copy.deepcopy(txn) if txn else {}
+            if default_txn:
+                txn.update(default_txn)
+
+            if not txn.get('from'):
+                account = Account.from_key(private_key) if private_key else self.aide.account
+                if account:
+                    txn['from'] = account.address
+
+            contract_function = func(self, *args, private_key=private_key, **kwargs)
+            txn = contract_function.build_transaction(txn)
+            return self.aide.send_transaction(txn, fid=fid, private_key=private_key)
+
+        return wrapper
+
+    return decorator
+
+
+class StubFunction:
+
+    @staticmethod
+    def build_transaction(txn):
+        return txn
+
+
+class StubAide:
+    account = None
+
+    @staticmethod
+    def send_transaction(txn, fid=None, result_type=None, private_key=None):
+        return txn
+
+
+class StubModule:
+    aide = StubAide()
+
+    @baseline_transaction()
+    def baseline(self, node_id, amount, private_key=None):
+        return StubFunction()
+
+    @contract_transaction()
+    def current(self, node_id, amount, private_key=None):
+        return StubFunction()
+
+
+def bench(method, private_key, calls):
+    txn = {'gasPrice': 1000000000, 'data': '0x' + '00' * 128}
+    start = time.perf_counter()
+    for _ in range(calls):
+        method('0x' + '11' * 64, 10 ** 18, txn=txn, private_key=private_key)
+    return (time.perf_counter() - start) / calls
+
+
+def main(calls=2000):
+    module = StubModule()
+    private_key = Account.create().key.hex()
+    for name in ('baseline', 'current'):
+        elapsed = bench(getattr(module, name), private_key, calls)
+        print(f'{name:<10} {elapsed * 1e6:10.1f}us/call')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
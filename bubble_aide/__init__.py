@@ -1,5 +1,7 @@
 from bubble_aide.main import Aide
+from bubble_aide.async_main import AsyncAide
 
 __all__ = [
     "Aide",
+    "AsyncAide",
 ]
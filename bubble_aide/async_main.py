@@ -0,0 +1,211 @@
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
+
+from eth_account.signers.local import LocalAccount
+
+from bubble_aide.main import Aide
+from bubble_aide.statics.economic import Economic
+from bubble_aide.utils.utils import PoolConfig
+
+async_modules = [
+    'bub',
+    'calculator',
+    'restricting',
+    'staking',
+    'stakingL2',
+    'bubble',
+    'bubbleL2',
+    'delegate',
+    'slashing',
+    'reward',
+    'govern',
+    'tempPrikey',
+]
+
+
+class AsyncModule:
+    """ Awaitable proxy of a synchronous module
+    Methods become coroutine functions, properties become awaitables, and other attributes are returned directly
+    """
+
+    def __init__(self, async_aide: "AsyncAide", module):
+        self.async_aide = async_aide
+        self.module = module
+
+    def __getattr__(self, name):
+        prop = getattr(type(self.module), name, None)
+        if isinstance(prop, property):
+            return self.async_aide.run(getattr, self.module, name)
+
+        attr = getattr(self.module, name)
+        if not callable(attr) or inspect.isclass(attr):
+            return attr
+
+        if getattr(attr, 'is_transaction', False):
+            return self._transaction_wrap(attr)
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.async_aide.run(attr, *args, **kwargs)
+
+        return wrapper
+
+    def _transaction_wrap(self, func):
+        """ Awaitable version of the contract_transaction method, the receipt is awaited without occupying a thread
+        """
+
+        @functools.wraps(func)
+        async def wrapper(*args, result_type=None, **kwargs):
+            result_type = result_type or self.async_aide.result_type
+            if result_type in ('txn', 'hash'):
+                return await self.async_aide.run(func, *args, result_type=result_type, **kwargs)
+
+            tx_hash = await self.async_aide.run(func, *args, result_type='hash', **kwargs)
+            return await self.async_aide.wait_transaction(tx_hash, fid=func.fid, result_type=result_type)
+
+        return wrapper
+
+
+class AsyncAide:
+    """ Asyncio version of Aide, for running a large number of concurrent requests in one event loop
+    The built-in contract modules of the sdk are synchronous, so their requests run in a bounded thread pool,
+    and transaction receipts are awaited through the receipt tracker without occupying a thread
+    """
+
+    def __init__(self,
+                 uri: str,
+                 account: LocalAccount = None,
+                 economic: Economic = None,
+                 pool: PoolConfig = None,
+                 lazy: bool = False,
+                 max_concurrency: int = 32,
+                 executor: ThreadPoolExecutor = None,
+                 ):
+        """
+        Args:
+            uri: RPC links open to nodes
+            account: Default address applicable when sending signed transactions
+            economic: On chain economic model data, see Aide
+            pool: Connection pool configuration, the pool size should not be less than max_concurrency
+            lazy: Create the modules of Aide on first access, see Aide
+            max_concurrency: Maximum number of requests running at the same time
+            executor: Executor for running requests, it can be shared by multiple AsyncAide
+        """
+        pool = pool or PoolConfig(pool_size=max_concurrency)
+        self.aide = Aide(uri, account=account, economic=economic, pool=pool, lazy=lazy)
+        self.executor = executor or ThreadPoolExecutor(max_concurrency, thread_name_prefix='async-aide')
+
+    def __getattr__(self, name):
+        # Create the async module on first access, so that the modules of a lazy Aide stay lazy
+        if name not in async_modules:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        module = AsyncModule(self, getattr(self.aide, name))
+        setattr(self, name, module)
+        return module
+
+    @property
+    def web3(self):
+        return self.aide.web3
+
+    @property
+    def economic(self):
+        """ Awaitable economic data, it is fetched in the executor on first access of a lazy aide
+        """
+        return self.run(getattr, self.aide, 'economic')
+
+    @property
+    def account(self):
+        return self.aide.account
+
+    @property
+    def result_type(self):
+        return self.aide.result_type
+
+    def set_account(self, account: LocalAccount):
+        """ Set default account for sending transactions
+        """
+        self.aide.set_account(account)
+
+    def set_result_type(self,
+                        result_type: Literal['auto', 'txn', 'hash', 'receipt', 'event']
+                        ):
+        """ Set the result type returned by the transaction, see Aide.set_result_type
+        """
+        self.aide.set_result_type(result_type)
+
+    async def run(self, func, *args, **kwargs):
+        """ Run a synchronous function in the executor
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def wait_transaction(self, tx_hash, fid=None, result_type='receipt', timeout=20):
+        """ Wait for the result of the transaction through the receipt tracker
+        """
+        future = self.aide.receipt_tracker.track(tx_hash, fid=fid, result_type=result_type, timeout=timeout)
+        # Cancelling the await does not cancel the tracked future, which is shared with the sync aide
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def send_transaction(self, txn: dict, fid=None, result_type=None, private_key=None):
+        """ Sign the transaction and send it, then await the result according to the result type
+        """
+        result_type = result_type or self.result_type
+        if result_type in ('txn', 'hash'):
+            return await self.run(self.aide.send_transaction, txn, result_type=result_type, private_key=private_key)
+
+        tx_hash = await self.run(self.aide.send_transaction, txn, result_type='hash', private_key=private_key)
+        return await self.wait_transaction(tx_hash, fid=fid, result_type=result_type)
+
+    async def transfer(self, to_address, amount, txn=None, private_key=None, result_type=None):
+        """ Send transfer transaction
+        """
+        result_type = result_type or self.result_type
+        if result_type in ('txn', 'hash'):
+            return await self.run(self.aide.transfer, to_address, amount, txn, private_key, result_type=result_type)
+
+        tx_hash = await self.run(self.aide.transfer, to_address, amount, txn, private_key, result_type='hash')
+        return await self.wait_transaction(tx_hash, result_type=result_type)
+
+    async def get_transaction_receipt(self, tx_hash, timeout=20):
+        return await self.wait_transaction(tx_hash, timeout=timeout)
+
+    async def get_balance(self, address, block_identifier=None):
+        """ Query the balance of free amount
+        """
+        return await self.run(self.aide.get_balance, address, block_identifier)
+
+    async def wait_block(self, to_block, time_out=None):
+        """ Waiting block high without blocking the event loop, the waiters share the head watcher of aide
+        """
+        current_block = await self.run(getattr, self.aide.head_watcher, 'current_block')
+        # Resolve the economic data in the executor, the timeout is derived from it
+        await self.economic
+        time_out = time_out or self.aide.get_wait_timeout(to_block - current_block + 1)
+
+        # Waiting for confirmation of chain drop
+        if current_block <= to_block:
+            future = self.aide.head_watcher.future(to_block + 1)
+            try:
+                await asyncio.wait_for(asyncio.wrap_future(future), time_out)
+            except asyncio.TimeoutError:
+                raise TimeoutError('wait block timeout!')
+
+    async def wait_period(self,
+                          period_type: Literal['round', 'consensus', 'epoch', 'increasing'] = 'epoch',
+                          wait_count: int = 1,
+                          ):
+        """ Based on the current block height, wait for n specified cycles
+        """
+        current_block = await self.bub.block_number
+        await self.economic
+        current_period, _, _ = self.aide.calculator.get_period_info(current_block, period_type=period_type)
+        dest_period = current_period + wait_count - 1
+        _, end_block = self.aide.calculator.get_period_ends(dest_period, period_type=period_type)
+        await self.wait_block(end_block)
+
+    async def ec_recover(self, block_identifier):
+        return await self.run(self.aide.ec_recover, block_identifier)
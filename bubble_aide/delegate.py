@@ -1,7 +1,9 @@
 from typing import TYPE_CHECKING
 from bubble.datastructures import AttributeDict
+from eth_utils import remove_0x_prefix
 
 from bubble_aide.abc.module import PrecompileContract
+from bubble_aide.utils.utils import iter_concurrently
 from bubble_aide.utils.wrapper import contract_transaction
 
 if TYPE_CHECKING:
@@ -83,6 +85,65 @@ class Delegate(PrecompileContract):
         else:
             return DelegateInfo(delegate_info)
 
+    def get_delegate_infos(self, queries, batch_size=100, max_workers=8):
+        """ Query the delegation information of many (address, node_id[, staking_block]) in bulk
+        The staking blocks not specified are resolved once per node from the candidate list, and the queries are sent
+        as json-rpc batches of batch_size, with at most max_workers batches running at the same time.
+        Yield ((address, node_id, staking_block), result) as the batches complete, the result is DelegateInfo,
+        None if the delegation is not found, or the exception of the failed query.
+        """
+        staking_blocks = {}
+
+        def resolve(query):
+            address, node_id, *staking_block = query
+            if staking_block and staking_block[0]:
+                return address, node_id, staking_block[0]
+
+            if node_id not in staking_blocks:
+                # The error of resolving is recorded for the node, and becomes the result of its queries
+                try:
+                    candidates = self.aide.staking.get_candidate_list(cache=True)
+                    candidate = candidates.get(node_id) or candidates.get(remove_0x_prefix(node_id))
+                    if not candidate:
+                        candidate = self.aide.staking.get_candidate_info(node_id)
+                    staking_blocks[node_id] = candidate.StakingBlockNum if candidate else None
+                except Exception as e:
+                    staking_blocks[node_id] = e
+
+            return address, node_id, staking_blocks[node_id]
+
+        def query_batch(batch_queries):
+            with self.aide.batch() as batch:
+                for address, node_id, staking_block in batch_queries:
+                    if staking_block is not None and not isinstance(staking_block, Exception):
+                        batch.add(self.get_delegate_info, address, node_id, staking_block)
+
+            results = iter(batch.results)
+            return [staking_block if isinstance(staking_block, Exception)
+                    else ValueError(f'the staking block of node {node_id} is not found') if staking_block is None
+                    else next(results)
+                    for _, node_id, staking_block in batch_queries]
+
+        def iter_batches():
+            batch_queries = []
+            for query in queries:
+                batch_queries.append(resolve(query))
+                if len(batch_queries) >= batch_size:
+                    yield batch_queries
+                    batch_queries = []
+
+            if batch_queries:
+                yield batch_queries
+
+        for batch_queries, results in iter_concurrently(query_batch, iter_batches(), max_workers=max_workers):
+            if isinstance(results, Exception):
+                results = [results] * len(batch_queries)
+
+            for (address, node_id, staking_block), result in zip(batch_queries, results):
+                # The staking block of a failed resolving is its exception, it is yielded as None in the query
+                staking_block = None if isinstance(staking_block, Exception) else staking_block
+                yield (address, node_id, staking_block), result
+
     def get_delegate_lock_info(self,
                                address=None,
                                ):
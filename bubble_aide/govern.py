@@ -1,8 +1,11 @@
-from time import time
+import bisect
+import threading
+from time import time, monotonic
 from typing import TYPE_CHECKING, Union, Literal
 
 from bubble.datastructures import AttributeDict
 from eth_typing import HexStr, NodeID, BlockIdentifier
+from loguru import logger
 
 from bubble_aide.abc.module import PrecompileContract
 from bubble_aide.utils.wrapper import contract_transaction
@@ -32,6 +35,7 @@ class Govern(PrecompileContract):
     def __init__(self, aide: "Aide"):
         super().__init__(aide)
         self.address = self.aide.web3.proposal.ADDRESS
+        self.tracker = ProposalTracker(self)
 
     def chain_version(self, version=None):
         """ Obtain version information on the chain or convert specified version information
@@ -160,15 +164,10 @@ class Govern(PrecompileContract):
     def get_newest_proposal(self, proposal_type: Literal[1, 2, 3, 4] = None):
         """ Obtain the latest activation status proposal information
         """
-        block_number = self.aide.web3.bub.block_number
-        proposal_list = self.proposal_list(proposal_type)
-
-        proposals = [proposal for proposal in proposal_list if proposal.EndVotingBlock > block_number]
-
-        if not proposals:
-            return None
-
-        return proposals[0]
+        # Answered from the local proposals, which are updated by the tracker at most once per interval, or every block when following.
+        # The voting period is checked against the current head, it is free when the head watcher is fresh
+        self.tracker.refresh()
+        return self.tracker.newest(proposal_type, self.aide.head_watcher.current_block)
 
     def get_proposal_result(self, proposal_id: Union[bytes, HexStr]):
         """ Obtain information on proposal voting results
@@ -227,6 +226,126 @@ class Govern(PrecompileContract):
         return self.aide.web3.proposal.get_govern_param(module, name).call()
 
 
+class ProposalTracker:
+    """ Local copy of the proposals on the chain, indexed by id, by type and by EndVotingBlock
+    Proposals do not change after submission, so only the new proposals are converted and indexed on each update,
+    and queries such as active proposals or the newest proposal of a type are answered in memory.
+    """
+
+    def __init__(self, govern: Govern, interval: float = None):
+        """
+        Args:
+            govern: Govern object
+            interval: Minimum seconds between the updates of refresh(), default is the block time
+        """
+        self.govern = govern
+        self.interval = interval
+        self.block_number = None  # The block number of the last update
+        self._updated_time = 0
+        self.proposals = {}
+        self._by_type = {}
+        self._end_blocks = []  # Sorted (EndVotingBlock, SubmitBlock, ProposalID)
+        self._lock = threading.Lock()
+        self._follower = None
+
+    def update(self, block_number=None, force=False):
+        """ Fetch the proposal list and index the new proposals, it is skipped if the block number has not changed
+        """
+        block_number = block_number or self.govern.aide.head_watcher.current_block
+        if block_number == self.block_number and not force:
+            return
+
+        proposal_list = self.govern.aide.web3.proposal.proposal_list().call()
+        if proposal_list == 'Object not found':
+            proposal_list = []
+
+        with self._lock:
+            for proposal in proposal_list:
+                if proposal['ProposalID'] not in self.proposals:
+                    self._add(to_attribute_proposal(proposal))
+            self.block_number = block_number
+            self._updated_time = monotonic()
+
+    def refresh(self):
+        """ Update the proposals on demand, it is skipped while following the chain or within the interval since the last update
+        """
+        interval = self.interval or self.govern.aide.block_time
+        if self._follower or monotonic() - self._updated_time < interval:
+            return
+
+        self.update()
+
+    def _add(self, proposal):
+        self.proposals[proposal.ProposalID] = proposal
+        self._by_type.setdefault(proposal.ProposalType, []).append(proposal)
+        bisect.insort(self._end_blocks, (int(proposal.EndVotingBlock), int(proposal.SubmitBlock), proposal.ProposalID))
+
+    def follow(self):
+        """ Update the proposals at every new block in a background thread, until stop() is called
+        """
+        if self._follower:
+            return
+
+        # The proposals are available when it returns
+        self.update()
+        self._follower = threading.Event()
+        threading.Thread(target=self._follow, args=(self._follower,), name='proposal-tracker', daemon=True).start()
+
+    def stop(self):
+        if self._follower:
+            self._follower.set()
+            self._follower = None
+
+    def _follow(self, stopped):
+        watcher = self.govern.aide.head_watcher
+        while not stopped.is_set():
+            try:
+                block_number = watcher.wait((self.block_number or watcher.current_block) + 1)
+                self.update(block_number)
+            except Exception as e:
+                logger.warning(f'update proposals failed: {e}')
+                stopped.wait(self.govern.aide.block_time)
+
+    def get(self, proposal_id):
+        """ Get the proposal by id, return None if not found
+        """
+        return self.proposals.get(proposal_id)
+
+    def get_by_type(self, proposal_type: Literal[1, 2, 3, 4]):
+        """ Get all proposals of the type in the order of submission
+        """
+        return list(self._by_type.get(proposal_type, []))
+
+    def active(self, block_number=None, proposal_type: Literal[1, 2, 3, 4] = None):
+        """ Get the proposals still in the voting period at the block number, default is the current head
+        """
+        block_number = block_number or self.govern.aide.head_watcher.current_block
+        with self._lock:
+            index = bisect.bisect_right(self._end_blocks, (block_number, float('inf')))
+            proposals = [self.proposals[item[2]] for item in self._end_blocks[index:]]
+
+        if proposal_type:
+            proposals = [proposal for proposal in proposals if proposal.ProposalType == proposal_type]
+
+        return proposals
+
+    def newest(self, proposal_type: Literal[1, 2, 3, 4] = None, block_number=None):
+        """ Get the newest submitted proposal in the voting period, return None if there is no active proposal
+        """
+        proposals = self.active(block_number, proposal_type)
+        if not proposals:
+            return None
+
+        return max(proposals, key=lambda proposal: int(proposal.SubmitBlock))
+
+    def ending_before(self, height):
+        """ Get the proposals whose voting period ends before the height
+        """
+        with self._lock:
+            index = bisect.bisect_left(self._end_blocks, (height,))
+            return [self.proposals[item[2]] for item in self._end_blocks[:index]]
+
+
 class ChainVersion(AttributeDict):
     integer: int
     major: int
@@ -1,10 +1,12 @@
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
 
-import rlp
 from bubble_aide.temp_prikey import TempPrikey
 from hexbytes import HexBytes
 from loguru import logger
+from requests import Session
+from bubble.datastructures import AttributeDict
 from bubble.inner_contract import InnerContractEvent
 from bubble.main import get_default_modules
 from eth_account import Account
@@ -25,12 +27,40 @@ from bubble_aide.reward import Reward
 from bubble_aide.govern import Govern
 from bubble_aide.statics.graphqls import Graphql
 from bubble_aide.statics.constant import Constant
-from bubble_aide.utils.utils import get_web3, get_economic, precompile_contracts
-from eth_account._utils.signing import to_standard_signature_bytes
-from eth_hash.auto import keccak
-from eth_keys.datatypes import Signature
-from eth_typing import HexStr
-from eth_utils import remove_0x_prefix, to_canonical_address
+from bubble_aide.statics.nonce import NonceManager
+from bubble_aide.statics.cache import ChainCache
+from bubble_aide.statics.receipt import ReceiptTracker
+from bubble_aide.statics.batch import Batch, batch_middleware
+from bubble_aide.statics.gas import GasEstimator
+from bubble_aide.statics.signer_index import SignerIndex
+from bubble_aide.statics.watcher import HeadWatcher
+from bubble_aide.statics.scheduler import PeriodScheduler
+from bubble_aide.statics.scanner import PortfolioScanner
+from bubble_aide.utils.utils import get_web3, get_economic, get_account, precompile_contracts, PoolConfig, \
+    economic_cache_dir
+from bubble_aide.utils.signer import ProcessSigner
+from bubble_aide.utils.recover import get_header_data, recover_node_id, recover_headers
+
+
+# Modules and data that can be created on first access, see Aide(lazy=True)
+lazy_modules = {
+    'economic': get_economic,
+    'constant': Constant,
+    'graphql': lambda aide: Graphql(f'{aide.uri}/bubble/graphql'),
+    'calculator': Calculator,
+    'restricting': Restricting,
+    'staking': Staking,
+    'stakingL2': StakingL2,
+    'bubble': Bubble,
+    'bubbleL2': BubbleL2,
+    'delegate': Delegate,
+    'slashing': Slashing,
+    'reward': Reward,
+    'govern': Govern,
+    'tempPrikey': TempPrikey,
+    'period_scheduler': PeriodScheduler,
+    'portfolio_scanner': PortfolioScanner,
+}
 
 
 class Aide:
@@ -38,49 +68,82 @@ class Aide:
     def __init__(self,
                  uri: str,
                  account: LocalAccount = None,
-                 economic: Economic = None
+                 economic: Economic = None,
+                 pool: PoolConfig = None,
+                 session: Session = None,
+                 lazy: bool = False,
+                 economic_cache: str = economic_cache_dir,
+                 signer_index: str = None,
                  ):
         """
         Args:
             uri: RPC links open to nodes
             account: Default address applicable when sending signed transactions
             economic: On chain economic model data will be automatically obtained (requiring an open debug interface), and the lack of economic model data will result in some functions being unavailable.
+            pool: Connection pool configuration of http uri, Aide with the same uri and configuration share one session
+            session: Http session shared with other Aide, it takes precedence over the pool configuration
+            lazy: Do not check the connection, and create the modules, economic data and graphql client on first access
+            economic_cache: Directory for caching the economic data of chains, None means not cached
+            signer_index: Sqlite file for indexing the signer node of blocks, None means not indexed
         """
+        self._lazy_lock = threading.RLock()
         self.uri = uri
+        self.economic_cache = economic_cache
         self.account = account
-        self.economic = economic
+        if economic or not lazy:
+            self.economic = economic
+        self.pool = pool
+        self.session = session
+        self.lazy = lazy
         self.result_type = 'auto'  # The result type returned by the transaction，Through self.set_result_type() settings
         # Set module
         self.__init_web3__()
+        self.signer_index = SignerIndex(signer_index, self.bub.get_block(0).hash.hex()) if signer_index else None
         self.__init_modules__()
 
     def __init_web3__(self):
         """ Set up web related modules
         """
-        self.web3 = get_web3(self.uri)
+        self.web3 = get_web3(self.uri, pool=self.pool, session=self.session, check_connection=not self.lazy)
+        self.web3.middleware_onion.inject(batch_middleware, 'batch', layer=0)
         self.bub = self.web3.bub
         self.txpool = self.web3.node.txpool
         self.personal = self.web3.node.personal
         self.admin = self.web3.node.admin
         self.debug = self.web3.debug
+        self.nonce_manager = NonceManager(self)
+        self.chain_cache = ChainCache(self)
+        self.receipt_tracker = ReceiptTracker(self)
+        self.gas_estimator = GasEstimator(self)
+        self.head_watcher = HeadWatcher(self)
 
     def __init_modules__(self):
         """ Set bubble built-in contract related modules
         """
-        self.economic = get_economic(self)
-        self.constant = Constant(self)
-        self.graphql = Graphql(f'{self.uri}/bubble/graphql')
-        self.calculator = Calculator(self)
-        self.restricting = Restricting(self)
-        self.staking = Staking(self)
-        self.stakingL2 = StakingL2(self)
-        self.bubble = Bubble(self)
-        self.bubbleL2 = BubbleL2(self)
-        self.delegate = Delegate(self)
-        self.slashing = Slashing(self)
-        self.reward = Reward(self)
-        self.govern = Govern(self)
-        self.tempPrikey = TempPrikey(self)
+        if self.lazy:
+            return
+
+        with ThreadPoolExecutor(1) as executor:
+            # Fetch the economic data while building the modules
+            economic = None if self.economic else executor.submit(get_economic, self)
+            for name, module in lazy_modules.items():
+                if name != 'economic':
+                    setattr(self, name, module(self))
+
+            if economic:
+                self.economic = economic.result()
+
+    def __getattr__(self, name):
+        # Only called when the attribute does not exist, that is, the module is not created yet in lazy mode
+        module = lazy_modules.get(name)
+        if not module:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        with self._lazy_lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = module(self)
+
+        return self.__dict__[name]
 
     def set_account(self, account: LocalAccount):
         """ Set default account for sending transactions
@@ -118,14 +181,14 @@ class Aide:
         """
         return to_checksum_address(address)
 
-    def transfer(self, to_address, amount, txn=None, private_key=None):
+    def transfer(self, to_address, amount, txn=None, private_key=None, result_type=None):
         """ Send transfer transaction
         """
         transfer_txn = {
-            "chainId": self.bub.chain_id,
+            "chainId": self.chain_cache.chain_id,
             "to": to_address,
             "gas": 21000,
-            "gasPrice": self.bub.gas_price,
+            "gasPrice": self.chain_cache.gas_price,
             "value": amount,
             "data": '',
         }
@@ -133,7 +196,12 @@ class Aide:
         if txn:
             transfer_txn.update(txn)
 
-        return self.send_transaction(transfer_txn, private_key=private_key)
+        return self.send_transaction(transfer_txn, result_type=result_type, private_key=private_key)
+
+    def batch(self, max_rounds=8):
+        """ Create a batch to send read calls in json-rpc batch requests, the results keep the return type of each call
+        """
+        return Batch(self, max_rounds=max_rounds)
 
     def get_balance(self, address, block_identifier=None):
         """ Query the balance of free amount
@@ -166,23 +234,31 @@ class Aide:
 
     def wait_block(self, to_block, time_out=None):
         """ Waiting block high
+        All waiting threads share one head watcher, see HeadWatcher
         """
-        current_block = self.bub.block_number
-        time_out = time_out or (to_block - current_block) * 3
+        current_block = self.head_watcher.current_block
+        time_out = time_out or self.get_wait_timeout(to_block - current_block + 1)
 
-        for i in range(time_out):
-            time.sleep(1)
-            current_block = self.bub.block_number
+        # Waiting for confirmation of chain drop
+        if current_block <= to_block:
+            current_block = self.head_watcher.wait(to_block + 1, time_out)
 
-            if i % 10 == 0:
-                logger.info(f'waiting block: {current_block} -> {to_block}')
+        logger.info(f'waiting block: {current_block} -> {to_block}')
+
+    @property
+    def block_time(self):
+        """ Block time of the economic model in seconds, 1 second if the economic model is unavailable
+        """
+        return (self.economic.block_time if self.economic else 0) or 1
 
-            # Waiting for confirmation of chain drop
-            if current_block > to_block:
-                logger.info(f'waiting block: {current_block} -> {to_block}')
-                return
+    def get_wait_timeout(self, blocks):
+        """ Timeout for waiting the number of blocks, derived from the economic model
+        Twice the expected time and one more window period are allowed for view changes
+        """
+        if not self.economic:
+            return max(blocks, 1) * 3
 
-        raise TimeoutError('wait block timeout!')
+        return max(blocks, 1) * self.block_time * 2 + self.economic.round_time
 
     def wait_period(self,
                     period_type: Literal['round', 'consensus', 'epoch', 'increasing'] = 'epoch',
@@ -199,33 +275,148 @@ class Aide:
         """ Sign the transaction and send it, return the transaction hash
         """
         result_type = result_type or self.result_type
+        account = self._get_account(private_key)
 
-        account = self.bub.account.from_key(private_key) if private_key else self.account
-        if not account:
-            raise ValueError('no private key for signature')
-
-        if not txn.get('from'):
-            txn['from'] = account.address
-            txn.pop('gas')
-
-        txn['gas'] = txn.get('gas') or self.bub.estimate_gas(txn)
-        txn['gasPrice'] = txn.get('gasPrice') or self.bub.gas_price
-        txn['nonce'] = txn.get('nonce') or self.bub.get_transaction_count(account.address)
-        txn['chainId'] = txn.get('chainId') or self.bub.chain_id
-
-        # Return to transaction body
+        # Return to transaction body, the nonce is not taken since it will not be sent
         if result_type == "txn":
-            return txn
+            return self.fill_transaction(txn, account.address, allocate=False)
 
-        signed_txn = self.bub.account.sign_transaction(txn, account.key)
-        tx_hash = self.bub.send_raw_transaction(signed_txn.rawTransaction)
+        txn = self.fill_transaction(txn, account.address)
+        signed_txn = self._sign_transaction(txn, account)
+        tx_hash = self._send_raw_transaction(signed_txn.rawTransaction, account.address)
 
         # Return transaction hash
         if result_type == 'hash':
             return tx_hash
 
         receipt = self.get_transaction_receipt(tx_hash)
+        return self._process_receipt(receipt, fid=fid, result_type=result_type)
+
+    def send_transactions(self, txns, fid=None, result_type=None, private_key=None, timeout=120,
+                          signer: ProcessSigner = None):
+        """ Sign and send a batch of transactions, then wait for their results together
+        The results are returned in the order of txns, and the error of each transaction is recorded in its result instead of being raised
+
+        Args:
+            txns: Transactions to be sent, they are copied before filling
+            fid: Function id for decoding the events of built-in contracts
+            result_type: The result type of each transaction, same as send_transaction
+            private_key: Private key for signing all transactions, the default account is used if not specified
+            timeout: Seconds to wait for the receipts, counted from the end of broadcasting
+            signer: Sign the transactions in a process pool, each transaction is signed by the account of its from address
+        """
+        result_type = result_type or self.result_type
+        account = None if signer else self._get_account(private_key)
+        results = [{'txn': dict(txn), 'hash': None, 'result': None, 'error': None} for txn in txns]
+
+        # Transaction bodies are filled with the following nonces of each account, but the nonces are not taken
+        if result_type == 'txn':
+            next_nonces = {}
+            for result in results:
+                try:
+                    txn = result['txn']
+                    address = account.address if account else txn.get('from') or self._get_account(private_key).address
+                    if txn.get('nonce') is None and address in next_nonces:
+                        txn['nonce'] = next_nonces[address]
+                    result['txn'] = result['result'] = self.fill_transaction(txn, address, allocate=False)
+                    next_nonces[address] = result['txn']['nonce'] + 1
+                except Exception as e:
+                    result['error'] = e
+
+            return [TransactionResult(result) for result in results]
+
+        # Fill and sign all transactions, they are broadcast without waiting for receipts
+        for result in results:
+            try:
+                address = account.address if account else result['txn'].get('from') or self._get_account(private_key).address
+                result['txn'] = self.fill_transaction(result['txn'], address)
+                if account:
+                    signed_txn = self._sign_transaction(result['txn'], account)
+                    self._send_result(result, signed_txn.rawTransaction, result_type)
+            except Exception as e:
+                result['error'] = e
+
+        if signer:
+            unsigned = [result for result in results if not result['error']]
+            raw_transactions = signer.sign_transactions([result['txn'] for result in unsigned])
+            # Once a transaction of an account fails, its following transactions are not sent,
+            # otherwise they would wait in the txpool for the missing nonce and be executed after the gap is filled by a retry
+            failed_addresses = set()
+            for result, raw_transaction in zip(unsigned, raw_transactions):
+                address = result['txn']['from']
+                try:
+                    if address in failed_addresses:
+                        raise Exception(f'not sent, a previous transaction of {address} failed')
+                    if isinstance(raw_transaction, Exception):
+                        self.nonce_manager.reset(address)
+                        raise raw_transaction
+                    self._send_result(result, raw_transaction, result_type)
+                except Exception as e:
+                    failed_addresses.add(address)
+                    result['error'] = e
+
+        # Track receipts after the whole batch has been broadcast, they are polled together in one batch request per block
+        if result_type != 'hash':
+            futures = [self.receipt_tracker.track(result['hash'], fid=fid, result_type=result_type, timeout=timeout)
+                       if result['hash'] else None for result in results]
+            for result, future in zip(results, futures):
+                if not future:
+                    continue
+                try:
+                    result['result'] = future.result()
+                except Exception as e:
+                    result['error'] = e
+
+        return [TransactionResult(result) for result in results]
+
+    def fill_transaction(self, txn: dict, address, allocate=True):
+        """ Fill in the from, gas, gasPrice, nonce and chainId fields of the transaction
+        The nonce is taken from the nonce manager only if allocate, otherwise the next nonce is filled without being taken
+        """
+        if not txn.get('from'):
+            txn['from'] = address
+            txn.pop('gas', None)
+
+        txn['gas'] = txn.get('gas') or self.gas_estimator.estimate(txn)
+        txn['gasPrice'] = txn.get('gasPrice') or self.chain_cache.gas_price
+        txn['chainId'] = txn.get('chainId') or self.chain_cache.chain_id
+        # The nonce is filled last, so that it is not taken when filling other fields fails
+        if txn.get('nonce') is None:
+            txn['nonce'] = self.nonce_manager.get_nonce(address) if allocate else self.nonce_manager.peek_nonce(address)
+        elif allocate:
+            self.nonce_manager.observe(address, txn['nonce'])
+
+        return txn
+
+    def _send_result(self, result, raw_transaction, result_type):
+        result['hash'] = self._send_raw_transaction(raw_transaction, result['txn']['from'])
+        if result_type == 'hash':
+            result['result'] = result['hash']
+
+    def _get_account(self, private_key=None):
+        account = get_account(private_key) if private_key else self.account
+        if not account:
+            raise ValueError('no private key for signature')
 
+        return account
+
+    def _sign_transaction(self, txn, account):
+        try:
+            return self.bub.account.sign_transaction(txn, account.key)
+        except Exception:
+            # The nonce will not be sent, re-sync it on the next transaction
+            self.nonce_manager.reset(account.address)
+            raise
+
+    def _send_raw_transaction(self, raw_transaction, address):
+        try:
+            return self.bub.send_raw_transaction(raw_transaction)
+        except Exception:
+            # The nonce is not consumed by the node, re-sync it on the next transaction
+            self.nonce_manager.reset(address)
+            raise
+
+    def _process_receipt(self, receipt, fid=None, result_type=None):
         # Return transaction receipt
         if result_type == 'receipt':
             return receipt
@@ -240,11 +431,7 @@ class Aide:
     def get_transaction_receipt(self, tx_hash, timeout=20):
         """ 发送签名交易，并根据结果类型获取交易结果
         """
-        receipt = self.bub.wait_for_transaction_receipt(tx_hash, timeout=timeout)
-        if type(receipt) is bytes:
-            receipt = receipt.decode('utf-8')
-
-        return receipt
+        return self.receipt_tracker.track(tx_hash, timeout=timeout).result()
 
     @staticmethod
     def decode_data(receipt, fid=None):
@@ -253,25 +440,31 @@ class Aide:
     def ec_recover(self, block_identifier):
         """ Using the Keccak method to extract the signature node public key of the block
         """
+        if self.signer_index and type(block_identifier) is int:
+            node_id = self.signer_index.get(block_identifier)
+            if node_id:
+                return node_id
+
         block = self.web3.bub.get_block(block_identifier)
+        header_hash, sign = get_header_data(block)
+        node_id = recover_node_id(header_hash, sign)
+
+        if self.signer_index:
+            self.signer_index.put(block.number, node_id)
+
+        return node_id
+
+    @staticmethod
+    def ec_recover_headers(headers):
+        """ Extract the signature node public keys of a batch of blocks or rlp encoded headers, without accessing the node
+        """
+        return recover_headers(headers)
+
 
-        sign = block.extraData[32:]
-        extra = block.extraData[:32]
-        raw_data = [bytes.fromhex(remove_0x_prefix(block.parentHash.hex())),
-                    to_canonical_address(block.miner),
-                    bytes.fromhex(remove_0x_prefix(block.stateRoot.hex())),
-                    bytes.fromhex(remove_0x_prefix(block.transactionsRoot.hex())),
-                    bytes.fromhex(remove_0x_prefix(block.receiptsRoot.hex())),
-                    bytes.fromhex(remove_0x_prefix(block.logsBloom.hex())),
-                    block.number,
-                    block.gasLimit,
-                    block.gasUsed,
-                    block.timestamp,
-                    extra,
-                    bytes.fromhex(remove_0x_prefix(block.nonce.hex()))
-                    ]
-        hash_bytes = HexBytes(keccak(rlp.encode(raw_data)))
-        signature_bytes = HexBytes(sign)
-        signature_bytes_standard = to_standard_signature_bytes(signature_bytes)
-        signature = Signature(signature_bytes=signature_bytes_standard)
-        return remove_0x_prefix(HexStr(signature.recover_public_key_from_msg_hash(hash_bytes).to_hex()))
+class TransactionResult(AttributeDict):
+    """ Attribute dictionary class for the result of a transaction in batch
+    """
+    txn: dict
+    hash: HexBytes
+    result: object
+    error: Exception
@@ -1,18 +1,30 @@
+import threading
 from typing import TYPE_CHECKING
 from bubble.datastructures import AttributeDict
 
 from bubble_aide.abc.module import PrecompileContract
+from bubble_aide.utils.utils import get_account
 from bubble_aide.utils.wrapper import contract_transaction
 
 if TYPE_CHECKING:
     from bubble_aide import Aide
 
+# The period type in which each list is unchanged.
+# Epoch boundaries are also consensus boundaries, so the consensus period is safe for both verifier and validator lists.
+snapshot_periods = {
+    'verifier': 'consensus',
+    'validator': 'consensus',
+    'candidate': 'round',
+}
+
 
 class Staking(PrecompileContract):
 
     def __init__(self, aide: "Aide"):
         super().__init__(aide)
         self.address = self.aide.web3.dpos.staking.ADDRESS
+        self._snapshots = {}
+        self._snapshot_lock = threading.Lock()
 
     @property
     def staking_info(self):
@@ -41,7 +53,7 @@ class Staking(PrecompileContract):
                        ):
 
         if not benefit_address:
-            benefit_account = self.aide.bub.account.from_key(private_key) if private_key else self.aide.account
+            benefit_account = get_account(private_key) if private_key else self.aide.account
             if not benefit_account:
                 raise ValueError('the benefit address cannot be empty')
 
@@ -92,17 +104,57 @@ class Staking(PrecompileContract):
                                                         node_name, website, details
                                                         )
 
-    def get_verifier_list(self):
-        verifier_list = self.aide.web3.dpos.staking.get_verifier_list().call()
-        return [StakingInfo(verifier) for verifier in verifier_list]
-
-    def get_validator_list(self):
-        validator_list = self.aide.web3.dpos.staking.get_validator_list().call()
-        return [StakingInfo(validator) for validator in validator_list]
-
-    def get_candidate_list(self):
-        candidate_list = self.aide.web3.dpos.staking.get_candidate_list().call()
-        return [StakingInfo(candidate) for candidate in candidate_list]
+    def get_verifier_list(self, cache=True):
+        """ Get the verifier list, it is cached until the end of the consensus period if cache is True
+        """
+        return self._get_snapshot('verifier', self.aide.web3.dpos.staking.get_verifier_list, cache)
+
+    def get_validator_list(self, cache=True):
+        """ Get the validator list, it is cached until the end of the consensus period if cache is True
+        """
+        return self._get_snapshot('validator', self.aide.web3.dpos.staking.get_validator_list, cache)
+
+    def get_candidate_list(self, cache=False):
+        """ Get the candidate list, it is cached until the end of the round if cache is True
+        Note: The candidate list changes with staking transactions, so it is not cached by default
+        """
+        return self._get_snapshot('candidate', self.aide.web3.dpos.staking.get_candidate_list, cache)
+
+    def _get_snapshot(self, name, get_list, cache):
+        if not cache or not self.aide.economic:
+            return StakingSnapshot([StakingInfo(info) for info in get_list().call()])
+
+        # The snapshot is dropped by the head watcher at the boundary, and a fresh head of the watcher past the boundary is also checked
+        watcher = self.aide.head_watcher
+        snapshot = self._snapshots.get(name)
+        head = watcher.block_number if watcher.is_fresh() else None
+        if snapshot is not None and (head is None or head <= snapshot.end_block):
+            return snapshot
+
+        # The period is taken before the list, so a list fetched across the boundary is dropped at once
+        period, _, end_block = self.aide.calculator.get_period_info(watcher.current_block, snapshot_periods[name])
+        snapshot = StakingSnapshot([StakingInfo(info) for info in get_list().call()], period, end_block)
+        with self._snapshot_lock:
+            old_snapshot = self._snapshots.get(name)
+            if old_snapshot is not None:
+                old_snapshot.expire_future.cancel()
+            self._snapshots[name] = snapshot
+            snapshot.expire_future = watcher.future(end_block + 1, callback=lambda _: self._drop_snapshot(name, snapshot))
+
+        return snapshot
+
+    def _drop_snapshot(self, name, snapshot):
+        with self._snapshot_lock:
+            if self._snapshots.get(name) is snapshot:
+                self._snapshots.pop(name)
+
+    def clear_snapshots(self):
+        """ Discard the cached lists
+        """
+        with self._snapshot_lock:
+            for snapshot in self._snapshots.values():
+                snapshot.expire_future.cancel()
+            self._snapshots.clear()
 
     def get_candidate_info(self, node_id=None):
         node_id = node_id or self.aide.constant.node_id
@@ -122,6 +174,23 @@ class Staking(PrecompileContract):
         return self.aide.web3.dpos.staking.get_avg_block_time().call()
 
 
+class StakingSnapshot(list):
+    """ List of staking information of a period, indexed by NodeId, it should be treated as read only
+    """
+
+    def __init__(self, staking_infos, period=None, end_block=None):
+        super().__init__(staking_infos)
+        self.period = period
+        self.end_block = end_block  # The last block of the period
+        self.expire_future = None  # Resolved by the head watcher when the period ends
+        self.nodes = {staking_info.NodeId: staking_info for staking_info in staking_infos}
+
+    def get(self, node_id):
+        """ Get the staking information of the node, return None if the node is not in the list
+        """
+        return self.nodes.get(node_id)
+
+
 class StakingInfo(AttributeDict):
     """ Attribute Dictionary Class for Pledge Information
     """
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 from bubble.datastructures import AttributeDict
 
 from bubble_aide.abc.module import PrecompileContract
+from bubble_aide.utils.utils import get_account
 from bubble_aide.utils.wrapper import contract_transaction
 
 if TYPE_CHECKING:
@@ -32,7 +33,7 @@ class StakingL2(PrecompileContract):
                        ):
 
         if not benefit_address:
-            benefit_account = self.aide.bub.account.from_key(private_key)
+            benefit_account = get_account(private_key)
             if not benefit_account:
                 raise ValueError('the benefit address cannot be empty')
             benefit_address = benefit_account.address
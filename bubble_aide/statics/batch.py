@@ -0,0 +1,115 @@
+import json
+import threading
+from typing import TYPE_CHECKING
+
+from bubble._utils.encoding import Web3JsonEncoder
+
+from bubble_aide.utils.utils import make_batch_request
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+_local = threading.local()
+
+
+class BatchMissing(Exception):
+    """ Raised inside a batched call when its request has not been sent yet
+    """
+    pass
+
+
+def batch_middleware(make_request, w3):
+    """ Answer requests from the responses of the running batch of the current thread
+    """
+
+    def middleware(method, params):
+        batch = getattr(_local, 'batch', None)
+        if not batch or batch.aide.web3 is not w3:
+            return make_request(method, params)
+
+        return batch.respond(method, params)
+
+    return middleware
+
+
+class Batch:
+    """ Collect read calls and send their rpc requests in json-rpc batches
+    Each call is run once to record its request, then run again to get the result from the batch response.
+    A call that depends on several requests takes several rounds, each round is one batch request.
+
+    Usage:
+        with aide.batch() as batch:
+            batch.add(aide.staking.get_candidate_info, node_id)
+            batch.add(aide.get_balance, address)
+        candidate_info, balance = batch.results
+    """
+
+    def __init__(self, aide: "Aide", max_rounds: int = 8):
+        self.aide = aide
+        self.max_rounds = max_rounds
+        self.calls = []
+        self.results = None
+        self._responses = {}
+        self._requests = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not exc_type:
+            self.execute()
+
+    def add(self, func, *args, **kwargs):
+        """ Add a call to the batch, and return its index in the results
+        """
+        self.calls.append((func, args, kwargs))
+        return len(self.calls) - 1
+
+    def respond(self, method, params):
+        key = (method, json.dumps(params, cls=Web3JsonEncoder, sort_keys=True))
+        if key in self._responses:
+            return self._responses[key]
+
+        self._requests[key] = (method, params)
+        raise BatchMissing(method)
+
+    def execute(self):
+        """ Run all calls and return their results in order, the result of a failed call is its exception
+        """
+        results = [None] * len(self.calls)
+        pending = list(range(len(self.calls)))
+
+        for _ in range(self.max_rounds):
+            pending = self._run_calls(pending, results)
+            if not pending:
+                break
+
+            keys = list(self._requests)
+            responses = make_batch_request(self.aide.web3, [self._requests[key] for key in keys])
+            self._responses.update(zip(keys, responses))
+            self._requests.clear()
+
+        for i in self._run_calls(pending, results) if pending else []:
+            results[i] = RuntimeError('too many rounds of requests in the batch call')
+
+        self.results = results
+        return results
+
+    def _run_calls(self, indexes, results):
+        pending = []
+        # Restore the outer batch after the calls, so that a nested batch does not leave the outer calls unbatched
+        outer_batch = getattr(_local, 'batch', None)
+        _local.batch = self
+        try:
+            for i in indexes:
+                func, args, kwargs = self.calls[i]
+                try:
+                    results[i] = func(*args, **kwargs)
+                except BatchMissing:
+                    pending.append(i)
+                except Exception as e:
+                    results[i] = e
+        finally:
+            _local.batch = outer_batch
+
+        return pending
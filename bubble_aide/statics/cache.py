@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+
+class ChainCache:
+    """ Cache chain constants used by every transaction, to reduce the rpc requests of sending transactions
+    chain_id is cached permanently for the connection, gas_price is refreshed by time or by blocks
+    """
+
+    def __init__(self,
+                 aide: "Aide",
+                 gas_price_ttl: float = 10,
+                 gas_price_blocks: int = None,
+                 ):
+        """
+        Args:
+            aide: Aide object
+            gas_price_ttl: Seconds to cache the gas price, 0 means not cached
+            gas_price_blocks: Number of blocks to cache the gas price, it is converted to seconds by the block time of the economic model, and takes precedence over gas_price_ttl
+        """
+        self.aide = aide
+        self.gas_price_ttl = gas_price_ttl
+        self.gas_price_blocks = gas_price_blocks
+        self.hits = {'chain_id': 0, 'gas_price': 0}
+        self.misses = {'chain_id': 0, 'gas_price': 0}
+        self._chain_id = None
+        self._gas_price = None
+        self._gas_price_expire = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        """ Effective seconds to cache the gas price
+        """
+        if self.gas_price_blocks is not None and self.aide.economic:
+            return self.gas_price_blocks * self.aide.block_time
+        return self.gas_price_ttl
+
+    @property
+    def chain_id(self):
+        if self._chain_id is None:
+            self.misses['chain_id'] += 1
+            self._chain_id = self.aide.bub.chain_id
+        else:
+            self.hits['chain_id'] += 1
+        return self._chain_id
+
+    @property
+    def gas_price(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._gas_price is None or now >= self._gas_price_expire:
+                self.misses['gas_price'] += 1
+                self._gas_price = self.aide.bub.gas_price
+                self._gas_price_expire = now + self.ttl
+            else:
+                self.hits['gas_price'] += 1
+            return self._gas_price
+
+    def clear(self):
+        """ Clear all cached constants, for example after the node is switched
+        """
+        with self._lock:
+            self._chain_id = None
+            self._gas_price = None
+            self._gas_price_expire = 0
+
+    @property
+    def stats(self):
+        """ Hit and miss counts of each cached constant
+        """
+        return {name: {'hits': self.hits[name], 'misses': self.misses[name]} for name in self.hits}
@@ -1,10 +1,14 @@
 import math
-import warnings
-
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from decimal import Decimal
 from typing import Literal, TYPE_CHECKING
 from loguru import logger
 
+from bubble_aide.statics.economic import period_types
+from bubble_aide.utils.recover import get_header_fields, recover_header_fields
+
 if TYPE_CHECKING:
     from bubble_aide import Aide
 
@@ -13,6 +17,8 @@ class Calculator:
 
     def __init__(self, aide: "Aide"):
         self.aide = aide
+        self._recoverer = None  # Process pool for recovering signers, it is created on the first large range and reused
+        self._recoverer_lock = threading.Lock()
 
     def get_verifier_count(self):
         """ Obtain the number of validators for the settlement cycle
@@ -26,19 +32,73 @@ class Calculator:
         """
         start_bn = start_bn or 0
         end_bn = end_bn or self.aide.bub.block_number
-        if end_bn - start_bn > 1000:
-            warnings.warn('too many blocks to analyze, it will be a long wait')
 
-        block_count = 0
-        for bn in range(start_bn, end_bn + 1):
-            public_key = self.aide.ec_recover(bn)
-            if node_id in public_key:
-                block_count = block_count + 1
+        signer_index = self.aide.signer_index
+        if signer_index:
+            self.index_signers(start_bn, end_bn)
+            return signer_index.count_blocks(node_id, start_bn, end_bn)
+
+        block_counts = self.get_block_counts(start_bn, end_bn)
+        return sum(count for public_key, count in block_counts.items() if node_id in public_key)
+
+    def get_block_counts(self, start_bn=None, end_bn=None, **kwargs):
+        """ Get the number of blocks of all signer nodes in the block range in one pass
+        Only the blocks not in the signer index of aide are fetched and recovered, see recover_signers for kwargs
+        """
+        start_bn = start_bn or 0
+        end_bn = end_bn or self.aide.bub.block_number
+
+        signer_index = self.aide.signer_index
+        if signer_index:
+            self.index_signers(start_bn, end_bn, **kwargs)
+            return signer_index.get_block_counts(start_bn, end_bn)
+
+        signers = self.recover_signers(range(start_bn, end_bn + 1), **kwargs)
+        block_counts = Counter(node_id for _, node_id in signers if node_id)
+        return dict(block_counts)
+
+    def index_signers(self, start_bn, end_bn, **kwargs):
+        """ Recover the signers of the blocks missing in the signer index of aide, and add them to the index
+        """
+        block_numbers = self.aide.signer_index.missing(start_bn, end_bn)
+        if block_numbers:
+            self.aide.signer_index.put_many(self.recover_signers(block_numbers, **kwargs))
+
+    def recover_signers(self, block_numbers, fetch_workers=16, processes=None, chunk_size=256):
+        """ Recover the signer node public keys of the blocks, return a list of (block number, public key)
+        The blocks are fetched concurrently, and the public keys are recovered in a process pool.
+        A range of no more than one chunk is recovered in the current process, since starting the pool costs more than recovering it.
+
+        Args:
+            block_numbers: Block numbers to be recovered
+            fetch_workers: Number of threads fetching blocks
+            processes: Number of processes recovering signatures when the pool is created, default is the number of cpus
+            chunk_size: Number of blocks in a recovery task
+        """
+        block_numbers = list(block_numbers)
+
+        signers = []
+        with ThreadPoolExecutor(fetch_workers) as fetcher:
+            if len(block_numbers) <= chunk_size:
+                headers = [get_header_fields(block) for block in fetcher.map(self.aide.bub.get_block, block_numbers)]
+                return list(zip(block_numbers, recover_header_fields(headers)))
+
+            with self._recoverer_lock:
+                if not self._recoverer:
+                    self._recoverer = ProcessPoolExecutor(processes)
 
-            if bn % 100 == 0:
-                logger.info(f'analyzed to {bn}th block, count: {block_count}, waiting...')
+            futures = []
+            # Fetch the next chunk of blocks while the previous chunks are being recovered
+            for i in range(0, len(block_numbers), chunk_size):
+                chunk = block_numbers[i:i + chunk_size]
+                headers = [get_header_fields(block) for block in fetcher.map(self.aide.bub.get_block, chunk)]
+                futures.append((chunk, self._recoverer.submit(recover_header_fields, headers)))
+                logger.info(f'fetched to {chunk[-1]}th block, waiting...')
 
-        return block_count
+            for chunk, future in futures:
+                signers.extend(zip(chunk, future.result()))
+
+        return signers
 
     def get_period_info(self,
                         block_number=None,
@@ -46,16 +106,10 @@ class Calculator:
                         ):
         """ Obtain the number of cycles in which the block is located and the height of the block at the end of the cycle by using the block height and cycle type
         """
-        if period_type not in ['round', 'consensus', 'epoch', 'increasing']:
+        if period_type not in period_types:
             raise ValueError('unknown period type.')
 
-        blocks = {
-            'round': self.aide.economic.round_blocks,
-            'consensus': self.aide.economic.consensus_blocks,
-            'epoch': self.aide.economic.epoch_blocks,
-            'increasing': self.aide.economic.increasing_blocks,
-        }
-        period_blocks = blocks[period_type]
+        period_blocks = self.aide.economic.period_table[period_type]
 
         if not block_number:
             block_number = self.aide.bub.block_number
@@ -71,20 +125,38 @@ class Calculator:
                         ):
         """ Obtain the starting and ending block height of the cycle by the number and type of cycles
         """
-        if period_type not in ['round', 'consensus', 'epoch', 'increasing']:
+        if period_type not in period_types:
             raise ValueError('unknown period type.')
 
-        blocks = {
-            'round': self.aide.economic.round_blocks,
-            'consensus': self.aide.economic.consensus_blocks,
-            'epoch': self.aide.economic.epoch_blocks,
-            'increasing': self.aide.economic.increasing_blocks,
-        }
-        period_blocks = blocks[period_type]
+        period_blocks = self.aide.economic.period_table[period_type]
         start_block, end_block = (period - 1) * period_blocks + 1, period * period_blocks
 
         return start_block, end_block
 
+    def get_periods_info(self,
+                         block_numbers,
+                         period_type: Literal['round', 'consensus', 'epoch', 'increasing'] = 'epoch'
+                         ):
+        """ Batch version of get_period_info, map an array of block numbers to their periods without accessing the node
+        Return numpy arrays of (period, start block, end block), requires numpy to be installed
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError('numpy is required for batch period mapping, install it by: pip install numpy')
+
+        if period_type not in period_types:
+            raise ValueError('unknown period type.')
+
+        period_blocks = self.aide.economic.period_table[period_type]
+        block_numbers = np.asarray(block_numbers, dtype=np.int64)
+
+        periods = np.maximum((block_numbers + period_blocks - 1) // period_blocks, 1)
+        end_blocks = periods * period_blocks
+        start_blocks = end_blocks - period_blocks + 1
+
+        return periods, start_blocks, end_blocks
+
     def get_reward_info(self):
         """ Obtain reward information for the current settlement period
         """
@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -5,24 +7,37 @@ if TYPE_CHECKING:
 
 
 class Constant:
+    """ Identity of the connected node, the node info and program version are fetched once and cached
+    The cache is refreshed by refresh(), or when the program version of the node changes (the node is restarted after upgrading)
+    """
 
-    def __init__(self, aide: "Aide"):
+    def __init__(self, aide: "Aide", check_interval: float = 60):
+        """
+        Args:
+            aide: Aide object
+            check_interval: Seconds between checks of the program version, None means never check
+        """
         self.aide = aide
+        self.check_interval = check_interval
+        self._node_info = None
+        self._version_info = None
+        self._checked_time = 0
+        self._lock = threading.Lock()
 
     @property
     def node_id(self):
-        node_info = self.aide.admin.node_info()
+        node_info = self._get_node_info()
         node_id = node_info['enode'].split('//')[1].split('@')[0]  # 请使用enode中的节点id
         return node_id
 
     @property
     def node_version(self):
-        version_info = self.aide.admin.get_program_version()
+        version_info = self._get_version_info()
         return version_info['Version']
 
     @property
     def bls_pubkey(self):
-        node_info = self.aide.admin.node_info()
+        node_info = self._get_node_info()
         return node_info['blsPubKey']
 
     @property
@@ -31,5 +46,47 @@ class Constant:
 
     @property
     def version_sign(self):
-        version_info = self.aide.admin.get_program_version()
+        version_info = self._get_version_info()
         return version_info['Sign']
+
+    def refresh(self):
+        """ Discard the cached node identity, it will be fetched again on next access
+        """
+        with self._lock:
+            self._node_info = None
+            self._version_info = None
+
+    def _get_node_info(self):
+        self._check_version()
+        node_info = self._node_info
+        if node_info is None:
+            node_info = self._node_info = self.aide.admin.node_info()
+            self._checked_time = time.monotonic()
+
+        return node_info
+
+    def _get_version_info(self):
+        self._check_version()
+        version_info = self._version_info
+        if version_info is None:
+            version_info = self._version_info = self.aide.admin.get_program_version()
+            self._checked_time = time.monotonic()
+
+        return version_info
+
+    def _check_version(self):
+        """ Refresh the cache if the program version of the node has changed
+        """
+        if self.check_interval is None or (self._node_info is None and self._version_info is None):
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_time < self.check_interval:
+                return
+
+            self._checked_time = now
+            version_info = self.aide.admin.get_program_version()
+            if self._version_info is not None and version_info != self._version_info:
+                self._node_info = None
+            self._version_info = version_info
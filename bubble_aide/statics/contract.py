@@ -1,4 +1,3 @@
-import copy
 import functools
 from functools import wraps, partial
 from typing import TYPE_CHECKING
@@ -7,6 +6,7 @@ from bubble._utils.abi import filter_by_name
 from bubble.contract.contract import ContractFunction
 
 from bubble_aide.abc.module import PrecompileContract
+from bubble_aide.utils.utils import get_account
 
 if TYPE_CHECKING:
     from bubble_aide import Aide
@@ -96,13 +96,9 @@ def contract_transaction(func):
     @functools.wraps(func)
     def wrapper(self, *args, txn: dict = None, private_key=None, **kwargs):
         # Fill in the from address to prevent contract transactions from failing to verify the address when estimating gas
-        # txn = txn or {}
-        if txn:
-            txn = copy.deepcopy(txn)
-        else:
-            txn = {}
+        txn = dict(txn) if txn else {}
         if not txn.get('from'):
-            account = self.aide.bub.account.from_key(private_key) if private_key else self.aide.account
+            account = get_account(private_key) if private_key else self.aide.account
             if account:
                 txn['from'] = account.address
 
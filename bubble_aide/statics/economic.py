@@ -1,10 +1,14 @@
 import json
 import math
+from functools import cached_property
+from types import MappingProxyType
 from typing import Union
 from dataclasses import dataclass
 
 from dacite import from_dict
 
+period_types = ('round', 'consensus', 'epoch', 'increasing')
+
 
 @dataclass
 class CommonData:
@@ -72,6 +76,27 @@ class Economic:
     reward: RewardData
     slashing: SlashingData
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Replacing a config section invalidates the period table
+        self.__dict__.pop('period_table', None)
+
+    @cached_property
+    def period_table(self):
+        """ Number of blocks of each period type, it is computed once and read only
+        """
+        return MappingProxyType({
+            'round': self.round_blocks,
+            'consensus': self.consensus_blocks,
+            'epoch': self.epoch_blocks,
+            'increasing': self.increasing_blocks,
+        })
+
+    def refresh(self):
+        """ Recompute the period table after the config sections are modified in place
+        """
+        self.__dict__.pop('period_table', None)
+
     # 区块
     @property
     def block_time(self):
@@ -0,0 +1,144 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import rlp
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from rlp.sedes import big_endian_int
+
+from bubble_aide.utils.utils import precompile_contracts
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+# Intrinsic gas of a transaction and its calldata, the non-zero byte takes the higher frontier price to be safe
+tx_gas = 21000
+tx_data_zero_gas = 4
+tx_data_non_zero_gas = 68
+
+# Gas of the built-in contract functions whose gas is fixed by the protocol params of the chain, keyed by function type.
+# Each value is the base gas of the contract plus the gas of the function. The functions withdrawing rewards are not listed,
+# their gas depends on the number of unclaimed epochs.
+builtin_gas = {
+    1000: 6000 + 32000,  # createStaking
+    1001: 6000 + 12000,  # editCandidate
+    1002: 6000 + 20000,  # increaseStaking
+    1003: 6000 + 20000,  # withdrewStaking
+    1004: 6000 + 6000,  # delegate
+    2000: 9000 + 320000,  # submitText
+    2001: 9000 + 450000,  # submitVersion
+    2002: 9000 + 500000,  # submitParam
+    2003: 9000 + 2000,  # vote
+    2004: 9000 + 3000,  # declareVersion
+    2005: 9000 + 500000,  # submitCancel
+    4000: 18000,  # createRestrictingPlan, and release_plan_gas for each plan
+}
+release_plan_gas = 21000
+
+
+class GasEstimator:
+    """ Estimate the gas of transactions without an estimate_gas request for each transaction
+    The gas of built-in contract functions in the static gas table is computed from the table and the calldata,
+    other estimates of built-in contracts are cached by (to, function type, calldata length), and a safety margin is added to the cache hits.
+    The gas of solidity contracts depends on the contract state, so they are estimated every time unless cache_contracts is set.
+    """
+
+    def __init__(self, aide: "Aide", margin: float = 0.2, maxsize: int = 1024, cache_contracts: bool = False):
+        """
+        Args:
+            aide: Aide object
+            margin: Safety margin added to the cached estimates, 0.2 means 20%
+            maxsize: Maximum number of cached estimates
+            cache_contracts: Whether to cache the estimates of solidity contracts, only for contracts whose gas does not depend on state
+        """
+        self.aide = aide
+        self.margin = margin
+        self.maxsize = maxsize
+        self.cache_contracts = cache_contracts
+        # Gas of built-in contract functions, keyed by function type, see builtin_gas
+        self.static_gas = dict(builtin_gas)
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def estimate(self, txn: dict):
+        """ Estimate the gas of the transaction
+        """
+        to = txn.get('to')
+        data = txn.get('data') or '0x'
+        if not to:
+            return self.aide.bub.estimate_gas(txn)
+
+        to = to_checksum_address(to)
+        data = HexBytes(data)
+        selector = self.get_selector(to, data)
+        is_builtin = to.lower() in precompile_contracts
+        static_gas = self.get_static_gas(selector, data) if is_builtin else None
+        if static_gas:
+            self.hits += 1
+            return static_gas
+
+        if not self.cache_contracts and not is_builtin:
+            return self.aide.bub.estimate_gas(txn)
+
+        key = (to, selector, len(data))
+        with self._lock:
+            gas = self._cache.get(key)
+            if gas:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return gas
+
+        # The estimate is exact for this transaction, the margin is only for other transactions reusing it
+        self.misses += 1
+        gas = self.aide.bub.estimate_gas(txn)
+        with self._lock:
+            self._cache[key] = int(gas * (1 + self.margin))
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return gas
+
+    def get_static_gas(self, function_type, data):
+        """ Compute the gas of a built-in contract function from the static gas table and the calldata, return None if it is not in the table
+        """
+        gas = self.static_gas.get(function_type)
+        if not gas:
+            return None
+
+        if function_type == 4000:
+            try:
+                plans = rlp.decode(rlp.decode(data)[2])
+            except Exception:
+                return None
+            gas += release_plan_gas * len(plans)
+
+        return gas + tx_gas + self.get_data_gas(data)
+
+    @staticmethod
+    def get_data_gas(data):
+        """ Intrinsic gas of the calldata
+        """
+        zero_count = data.count(0)
+        return zero_count * tx_data_zero_gas + (len(data) - zero_count) * tx_data_non_zero_gas
+
+    @staticmethod
+    def get_selector(to, data):
+        """ Get the function type of built-in contracts, or the 4 bytes function selector of solidity contracts
+        """
+        data = HexBytes(data)
+        if to.lower() in precompile_contracts:
+            try:
+                return rlp.decode(rlp.decode(data)[0], sedes=big_endian_int)
+            except Exception:
+                return None
+
+        return data[:4]
+
+    def clear(self):
+        """ Clear the cached estimates, the static gas table is kept
+        """
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,62 @@
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+
+class NonceManager:
+    """ Allocate transaction nonces locally, so that one account can have multiple transactions in flight
+    The nonce of each account is synced from the node once, and re-synced when the node rejects it
+    """
+
+    def __init__(self, aide: "Aide"):
+        self.aide = aide
+        self._nonces = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _get_lock(self, address):
+        with self._lock:
+            lock = self._locks.get(address)
+            if not lock:
+                lock = self._locks[address] = threading.Lock()
+            return lock
+
+    def get_nonce(self, address):
+        """ Take the next nonce of the address, only the first call (or the call after reset) will access the node
+        """
+        with self._get_lock(address):
+            nonce = self._nonces.get(address)
+            if nonce is None:
+                nonce = self.aide.bub.get_transaction_count(address, 'pending')
+            self._nonces[address] = nonce + 1
+            return nonce
+
+    def peek_nonce(self, address):
+        """ Get the next nonce of the address without taking it, for transactions that are not sent
+        """
+        with self._get_lock(address):
+            nonce = self._nonces.get(address)
+            if nonce is None:
+                nonce = self.aide.bub.get_transaction_count(address, 'pending')
+            return nonce
+
+    def observe(self, address, nonce):
+        """ Record a nonce specified outside the manager, to avoid handing it out again
+        """
+        with self._get_lock(address):
+            current = self._nonces.get(address)
+            if current is not None and nonce >= current:
+                self._nonces[address] = nonce + 1
+
+    def reset(self, address=None):
+        """ Discard the local nonce, the next get_nonce will sync it from the node again
+        Call it when the node rejects a transaction (nonce too low, replacement underpriced, etc.)
+        """
+        if address:
+            with self._get_lock(address):
+                self._nonces.pop(address, None)
+        else:
+            with self._lock:
+                self._nonces.clear()
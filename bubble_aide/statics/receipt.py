@@ -0,0 +1,168 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+from bubble._utils.method_formatters import receipt_formatter
+from bubble.datastructures import AttributeDict
+from bubble.exceptions import TimeExhausted, TransactionNotFound
+from hexbytes import HexBytes
+from loguru import logger
+
+from bubble_aide.utils.utils import make_batch_request
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+receipt_method = 'bub_getTransactionReceipt'
+
+
+class ReceiptTracker:
+    """ Track the receipts of many pending transactions in one polling loop
+    All pending hashes are queried in one json-rpc batch for each new block, and the futures are resolved as the receipts land
+    """
+
+    def __init__(self, aide: "Aide", poll_latency: float = 0.5):
+        self.aide = aide
+        self.poll_latency = poll_latency
+        self._pending = {}
+        self._unchecked = False
+        self._batch_supported = True
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def track(self, tx_hash, fid=None, result_type='receipt', timeout=20, callback=None):
+        """ Add a transaction hash to the tracker, and return a future of its result
+
+        Args:
+            tx_hash: Transaction hash
+            fid: Function id for decoding the events of built-in contracts
+            result_type: receipt, or auto/event to decode the events of built-in contracts like send_transaction
+            timeout: Seconds to wait for the receipt, TimeExhausted is set to the future when timeout
+            callback: Called with the future when the result is set
+        """
+        future = Future()
+        if callback:
+            future.add_done_callback(callback)
+
+        tx_hash = HexBytes(tx_hash)
+        with self._lock:
+            self._pending.setdefault(tx_hash, []).append((future, fid, result_type, time.monotonic() + timeout))
+            self._unchecked = True
+            if not self._thread:
+                self._thread = threading.Thread(target=self._run, name='receipt-tracker', daemon=True)
+                self._thread.start()
+
+        return future
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            # Let the next track() start a new thread, even if this one is broken by an unexpected error
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _loop(self):
+        last_block = None
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                unchecked, self._unchecked = self._unchecked, False
+
+            try:
+                block_number = self.aide.bub.block_number
+                # Only query when there is a new block or a newly added hash
+                if block_number != last_block or unchecked:
+                    last_block = block_number
+                    self._poll()
+            except Exception as e:
+                logger.warning(f'poll transaction receipts failed: {e}')
+
+            self._expire()
+            time.sleep(self.poll_latency)
+
+    def _poll(self):
+        with self._lock:
+            tx_hashes = list(self._pending)
+
+        for tx_hash, receipt in zip(tx_hashes, self._get_receipts(tx_hashes)):
+            if not receipt:
+                continue
+
+            with self._lock:
+                waiters = self._pending.pop(tx_hash, [])
+
+            for future, fid, result_type, _ in waiters:
+                # The future is cancelled by the waiter
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    # The node returns an error for the hash instead of a receipt
+                    if isinstance(receipt, Exception):
+                        raise receipt
+                    future.set_result(self.aide._process_receipt(receipt, fid=fid, result_type=result_type))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def _get_receipts(self, tx_hashes):
+        """ Get the receipts of the hashes in one batch request, None for the transactions not in the chain yet,
+        and the exception for the hashes the node returns an error.
+        The receipts are queried one by one if the batch request fails
+        """
+        if self._batch_supported:
+            try:
+                responses = make_batch_request(self.aide.web3, [(receipt_method, [tx_hash.hex()]) for tx_hash in tx_hashes])
+                return [ValueError(response['error']) if response.get('error') else self._format_receipt(response.get('result'))
+                        for response in responses]
+            except ValueError as e:
+                # The node rejects json-rpc batch
+                logger.warning(f'batch request is not supported, query receipts one by one: {e}')
+                self._batch_supported = False
+            except Exception as e:
+                logger.warning(f'batch request of receipts failed, query receipts one by one: {e}')
+
+        return [self._get_receipt(tx_hash) for tx_hash in tx_hashes]
+
+    def _get_receipt(self, tx_hash):
+        try:
+            return self.aide.bub.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+        except ValueError as e:
+            # The error response of the node
+            return e
+
+    @staticmethod
+    def _format_receipt(result):
+        """ Format the raw receipt in the same way as bub.get_transaction_receipt
+        """
+        if not result:
+            return None
+
+        return AttributeDict.recursive(receipt_formatter(result))
+
+    def _expire(self):
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for tx_hash, waiters in list(self._pending.items()):
+                # The cancelled waiters are dropped, so that their hashes are not polled anymore
+                alive = [waiter for waiter in waiters if waiter[3] > now and not waiter[0].cancelled()]
+                expired.extend((tx_hash, waiter[0]) for waiter in waiters if waiter[3] <= now)
+                if alive:
+                    self._pending[tx_hash] = alive
+                else:
+                    self._pending.pop(tx_hash)
+
+        for tx_hash, future in expired:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(TimeExhausted(f'transaction {tx_hash.hex()} is not in the chain after timeout'))
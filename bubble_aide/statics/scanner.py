@@ -0,0 +1,126 @@
+import os
+import time
+from typing import TYPE_CHECKING
+
+from bubble_aide.utils.utils import iter_concurrently
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+# Fields of the records, the delegation fields keep the names of DelegateInfo
+record_fields = [
+    'Addr',
+    'NodeId',
+    'StakingBlockNum',
+    'DelegateEpoch',
+    'Released',
+    'ReleasedHes',
+    'RestrictingPlan',
+    'RestrictingPlanHes',
+    'CumulativeIncome',
+    'LockReleasedHes',
+    'LockRestrictingPlanHes',
+    'Reward',
+    'Error',
+]
+
+
+class PortfolioScanner:
+    """ Scan the delegations and pending rewards of a large number of addresses as a stream of flat records
+    Addresses are queried in json-rpc batches with bounded concurrency, and records are yielded as soon as their batch completes,
+    so the memory is bounded no matter how many addresses there are. The records can be written by csv.DictWriter(f, record_fields).
+    """
+
+    def __init__(self, aide: "Aide", batch_size: int = 50, max_workers: int = 8):
+        """
+        Args:
+            aide: Aide object
+            batch_size: Number of addresses queried in one batch request
+            max_workers: Maximum number of batch requests running at the same time
+        """
+        self.aide = aide
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.address_count = 0
+        self.record_count = 0
+        self.elapsed = 0
+
+    @property
+    def addresses_per_second(self):
+        """ Throughput of the last scan
+        """
+        return self.address_count / self.elapsed if self.elapsed else 0
+
+    def scan(self, addresses):
+        """ Yield a record for each delegation of the addresses, an address failed to query yields one record with Error
+
+        Args:
+            addresses: Iterable of addresses, or the path of a file with one address per line
+        """
+        self.address_count = self.record_count = 0
+        start_time = time.monotonic()
+
+        for chunk, records in iter_concurrently(self._scan_chunk, self._iter_chunks(addresses),
+                                                max_workers=self.max_workers):
+            if isinstance(records, Exception):
+                records = [self._error_record(address, records) for address in chunk]
+
+            self.address_count += len(chunk)
+            self.record_count += len(records)
+            self.elapsed = time.monotonic() - start_time
+            yield from records
+
+    def _iter_chunks(self, addresses):
+        if isinstance(addresses, (str, os.PathLike)):
+            addresses = self._read_addresses(addresses)
+
+        chunk = []
+        for address in addresses:
+            chunk.append(address)
+            if len(chunk) >= self.batch_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _read_addresses(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                address = line.strip()
+                if address:
+                    yield address
+
+    def _scan_chunk(self, chunk):
+        with self.aide.batch() as batch:
+            for address in chunk:
+                batch.add(self.aide.delegate.get_delegate_list, address)
+                batch.add(self.aide.reward.get_delegate_reward, address)
+
+        records = []
+        results = batch.results
+        for i, address in enumerate(chunk):
+            delegate_list, rewards = results[2 * i], results[2 * i + 1]
+            error = next((result for result in (delegate_list, rewards) if isinstance(result, Exception)), None)
+            if error:
+                records.append(self._error_record(address, error))
+                continue
+
+            # Pending rewards are keyed by node and staking block
+            rewards = {(reward.get('nodeID'), reward.get('stakingNum')): reward.get('reward')
+                       for reward in rewards if isinstance(reward, dict)} if type(rewards) is list else {}
+            for delegate_info in delegate_list:
+                record = {field: delegate_info.get(field) for field in record_fields}
+                record['Addr'] = record['Addr'] or address
+                record['Reward'] = rewards.get((delegate_info.NodeId, delegate_info.StakingBlockNum), 0)
+                records.append(record)
+
+        return records
+
+    @staticmethod
+    def _error_record(address, error):
+        record = dict.fromkeys(record_fields)
+        record['Addr'] = address
+        record['Error'] = str(error)
+        return record
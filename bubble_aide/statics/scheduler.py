@@ -0,0 +1,136 @@
+import functools
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, TYPE_CHECKING
+
+from bubble.datastructures import AttributeDict
+from loguru import logger
+
+from bubble_aide.statics.economic import period_types
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+
+class PeriodScheduler:
+    """ Run callbacks at the boundaries of round/consensus/epoch/increasing periods
+    The boundaries are computed by Calculator.get_period_ends and watched by the head watcher of aide,
+    callbacks run in a bounded thread pool, and boundaries missed while disconnected are caught up in order.
+    """
+
+    def __init__(self, aide: "Aide", max_workers: int = 4):
+        self.aide = aide
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='period-scheduler')
+        self._jobs = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def register(self,
+                 period_type: Literal['round', 'consensus', 'epoch', 'increasing'],
+                 callback,
+                 catch_up: bool = True,
+                 ):
+        """ Register a callback for the end of each period of the type, starting from the current period, return the job id
+
+        Args:
+            period_type: Period type
+            callback: Called with a PeriodEvent after the last block of the period is produced
+            catch_up: Whether to call back every missed boundary when the head jumps over several periods, otherwise only the latest one
+        """
+        if period_type not in period_types:
+            raise ValueError('unknown period type.')
+
+        # The head of the node is used, so that the boundaries before registering are never called back
+        period, _, _ = self.aide.calculator.get_period_info(self.aide.bub.block_number, period_type)
+        job_id = next(self._counter)
+        job = {'id': job_id, 'period_type': period_type, 'callback': callback, 'catch_up': catch_up,
+               'period': period, 'future': None}
+
+        with self._lock:
+            self._jobs[job_id] = job
+        self._schedule(job)
+
+        return job_id
+
+    def unregister(self, job_id):
+        """ Stop calling back the job
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+
+        if job and job['future']:
+            job['future'].cancel()
+
+    @property
+    def jobs(self):
+        return list(self._jobs)
+
+    def _schedule(self, job):
+        _, end_block = self.aide.calculator.get_period_ends(job['period'], job['period_type'])
+        # Waiting for confirmation of chain drop, same as wait_block
+        callback = functools.partial(self._on_boundary, job)
+        job['future'] = self.aide.head_watcher.future(end_block + 1, callback=callback)
+
+    def _on_boundary(self, job, block_number):
+        # It runs as a done callback in the watcher thread, an error would stop the job silently
+        try:
+            self._dispatch(job, block_number)
+        except Exception as e:
+            logger.error(f'{job["period_type"]} job {job["id"]} failed at block {block_number}, retry at next block: {e}')
+            if job['id'] in self._jobs:
+                callback = functools.partial(self._on_boundary, job)
+                job['future'] = self.aide.head_watcher.future(block_number + 1, callback=callback)
+
+    def _dispatch(self, job, block_number):
+        if job['id'] not in self._jobs:
+            return
+
+        reached_time = time.monotonic()
+        events = []
+        while True:
+            start_block, end_block = self.aide.calculator.get_period_ends(job['period'], job['period_type'])
+            if end_block >= block_number:
+                break
+
+            events.append({'period_type': job['period_type'],
+                           'period': job['period'],
+                           'start_block': start_block,
+                           'end_block': end_block,
+                           'block_number': block_number,
+                           'late_blocks': block_number - end_block - 1,
+                           })
+            job['period'] += 1
+
+        if not job['catch_up']:
+            events = events[-1:]
+
+        for event in events:
+            self.executor.submit(self._run_callback, job, event, reached_time)
+
+        self._schedule(job)
+
+    @staticmethod
+    def _run_callback(job, event, reached_time):
+        event = PeriodEvent(event, delay=time.monotonic() - reached_time)
+        if event.late_blocks or event.delay > 1:
+            logger.info(f'{event.period_type} {event.period} callback started late: '
+                        f'{event.late_blocks} blocks, {event.delay:.3f}s')
+
+        try:
+            job['callback'](event)
+        except Exception as e:
+            logger.error(f'{event.period_type} {event.period} callback failed: {e}')
+
+
+class PeriodEvent(AttributeDict):
+    """ Attribute dictionary class for period boundary
+    """
+    period_type: str
+    period: int
+    start_block: int
+    end_block: int
+    block_number: int  # The head block number when the boundary is detected
+    late_blocks: int  # Number of blocks between the boundary and the detection
+    delay: float  # Seconds between the detection and the start of the callback
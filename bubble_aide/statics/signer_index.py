@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+
+from eth_utils import remove_0x_prefix
+
+
+class SignerIndex:
+    """ Local sqlite index of the signer node of each block
+    The index is filled incrementally by Aide.ec_recover and Calculator.get_block_counts,
+    and block counts of nodes are answered by indexed range scans
+    """
+
+    def __init__(self, path: str, genesis_hash: str = None):
+        """
+        Args:
+            path: Sqlite database file, use one file per chain
+            genesis_hash: Genesis block hash of the chain, it is recorded in the file and checked on each open
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS block_signer '
+                               '(number INTEGER PRIMARY KEY, node_id TEXT NOT NULL)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS block_signer_node ON block_signer (node_id, number)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+        if genesis_hash:
+            self._check_genesis(self._normalize(genesis_hash))
+
+    def _check_genesis(self, genesis_hash):
+        """ Record the genesis hash in a new index, or reject an index of another chain
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'genesis_hash'").fetchone()
+            if not row:
+                self._conn.execute("INSERT INTO meta (key, value) VALUES ('genesis_hash', ?)", (genesis_hash,))
+
+        if row and row[0] != genesis_hash:
+            self.close()
+            raise ValueError(f'signer index {self.path} belongs to the chain of genesis {row[0]}, not {genesis_hash}')
+
+    @staticmethod
+    def _normalize(node_id):
+        return remove_0x_prefix(node_id).lower()
+
+    def get(self, block_number):
+        """ Get the signer node id of the block, return None if it is not indexed
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT node_id FROM block_signer WHERE number = ?', (block_number,)).fetchone()
+
+        return row[0] if row else None
+
+    def put(self, block_number, node_id):
+        self.put_many([(block_number, node_id)])
+
+    def put_many(self, items):
+        """ Add (block number, signer node id) items to the index
+        Unrecoverable blocks are recorded with an empty node id, so that they are not fetched again
+        """
+        items = [(block_number, self._normalize(node_id or '')) for block_number, node_id in items]
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO block_signer (number, node_id) VALUES (?, ?)', items)
+
+    def missing(self, start_bn, end_bn):
+        """ Get the block numbers in the range that are not indexed yet
+        A fully indexed range is answered by one count, otherwise only the boundaries of the gaps are read
+        """
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM block_signer WHERE number BETWEEN ? AND ?',
+                                       (start_bn, end_bn)).fetchone()[0]
+            if count >= end_bn - start_bn + 1:
+                return []
+
+            # A gap starts at the start of the range if it is not indexed, and after each indexed number whose next number is not indexed
+            starts = [row[0] for row in self._conn.execute(
+                'SELECT a.number + 1 FROM block_signer a WHERE a.number BETWEEN ? AND ? '
+                'AND NOT EXISTS (SELECT 1 FROM block_signer b WHERE b.number = a.number + 1)', (start_bn, end_bn - 1))]
+            if not self._conn.execute('SELECT 1 FROM block_signer WHERE number = ?', (start_bn,)).fetchone():
+                starts.insert(0, start_bn)
+
+            # Each gap ends before the next indexed number
+            missing = []
+            for start in starts:
+                end = self._conn.execute('SELECT MIN(number) FROM block_signer WHERE number > ? AND number <= ?',
+                                         (start, end_bn)).fetchone()[0]
+                missing.extend(range(start, end if end is not None else end_bn + 1))
+
+        return missing
+
+    def count_blocks(self, node_id, start_bn, end_bn):
+        """ Get the number of blocks signed by the node in the range
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT COUNT(*) FROM block_signer WHERE node_id = ? AND number BETWEEN ? AND ?',
+                                     (self._normalize(node_id), start_bn, end_bn)).fetchone()
+
+        return row[0]
+
+    def get_block_counts(self, start_bn, end_bn):
+        """ Get the number of blocks of all signer nodes in the range
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT node_id, COUNT(*) FROM block_signer WHERE number BETWEEN ? AND ? '
+                                      "AND node_id != '' GROUP BY node_id", (start_bn, end_bn)).fetchall()
+
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
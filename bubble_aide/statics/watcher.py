@@ -0,0 +1,154 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from bubble_aide.utils.subscription import HeadSubscription
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+
+class HeadWatcher:
+    """ Watch the chain head in one thread and wake up the waiters of block heights
+    The waiters are kept in a heap by target height, so the cost of waiting is one head query per block no matter how many waiters exist.
+    Block heads are subscribed on ws/ipc uri, and polled adaptively according to the nearest target on http uri.
+    """
+
+    def __init__(self, aide: "Aide"):
+        self.aide = aide
+        self.block_number = None  # The latest head, only available while watching
+        self.polled_time = 0  # The monotonic time when block_number was got from the node
+        self._waiters = []
+        self._counter = itertools.count()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    @property
+    def current_block(self):
+        """ The latest head known by the watcher, or query it from the node if the head of the watcher is not fresh
+        The watcher may sleep for many blocks while waiting for a far target, its head is not used then
+        """
+        block_number = self.block_number
+        if block_number is not None and self.is_fresh():
+            return block_number
+
+        return self.aide.bub.block_number
+
+    def is_fresh(self, max_age=None):
+        """ Whether the head of the watcher was got from the node within max_age seconds, default is about one block time
+        """
+        max_age = max_age if max_age is not None else self.aide.block_time * 1.5
+        return self.block_number is not None and time.monotonic() - self.polled_time < max_age
+
+    def future(self, height, callback=None):
+        """ Return a future which is resolved with the head block number when the chain reaches the height
+
+        Args:
+            height: Target block height
+            callback: Called with the head block number when the height is reached, it runs in the watcher thread and should return quickly
+        """
+        future = Future()
+        if callback:
+            future.add_done_callback(lambda f: f.cancelled() or f.exception() or callback(f.result()))
+
+        with self._lock:
+            heapq.heappush(self._waiters, (height, next(self._counter), future))
+            # Let the watcher re-plan if it is sleeping for a farther target
+            if self._waiters[0][2] is future:
+                self._wakeup.set()
+
+            if not self._thread:
+                self._thread = threading.Thread(target=self._run, name='head-watcher', daemon=True)
+                self._thread.start()
+
+        return future
+
+    def wait(self, height, timeout=None):
+        """ Block until the chain reaches the height, and return the head block number
+        """
+        future = self.future(height)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError('wait block timeout!')
+
+    def _run(self):
+        heads = None
+        try:
+            if HeadSubscription.supported(self.aide.uri):
+                try:
+                    heads = HeadSubscription(self.aide)
+                except ConnectionError as e:
+                    logger.warning(f'subscribe new heads failed, fallback to polling: {e}')
+
+            while True:
+                with self._lock:
+                    while self._waiters and self._waiters[0][2].cancelled():
+                        heapq.heappop(self._waiters)
+
+                    if not self._waiters:
+                        self._thread = None
+                        self.block_number = None
+                        return
+
+                    target = self._waiters[0][0]
+                    self._wakeup.clear()
+
+                try:
+                    block_number = self._next_head(heads, target)
+                except Exception as e:
+                    if heads and isinstance(e, ConnectionError):
+                        logger.warning(f'new heads subscription is broken, fallback to polling: {e}')
+                        heads.close()
+                        heads = None
+                        continue
+
+                    logger.warning(f'get block head failed: {e}')
+                    self._wakeup.wait(self.aide.block_time)
+                    continue
+
+                if block_number != self.block_number and block_number % 10 == 0:
+                    logger.info(f'waiting block: {block_number} -> {target}')
+
+                self.block_number = block_number
+                self.polled_time = time.monotonic()
+                self._resolve(block_number)
+        finally:
+            if heads:
+                heads.close()
+            # Let the next future() start a new thread, even if this one is broken by an unexpected error
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                    self.block_number = None
+
+    def _next_head(self, heads, target):
+        block_time = self.aide.block_time
+        if heads:
+            try:
+                return heads.next(timeout=block_time * 10)
+            except TimeoutError:
+                return self.aide.bub.block_number
+
+        # Sleep through most of the blocks to the nearest target, then poll every block
+        if self.block_number is not None:
+            self._wakeup.wait(max((target - self.block_number) * block_time * 0.8, block_time))
+
+        return self.aide.bub.block_number
+
+    def _resolve(self, block_number):
+        reached = []
+        with self._lock:
+            while self._waiters and self._waiters[0][0] <= block_number:
+                reached.append(heapq.heappop(self._waiters)[2])
+
+        for future in reached:
+            if future.set_running_or_notify_cancel():
+                future.set_result(block_number)
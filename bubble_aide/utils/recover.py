@@ -0,0 +1,95 @@
+import rlp
+from eth_hash.auto import keccak
+from eth_keys.datatypes import Signature
+
+try:
+    # coincurve recovers public keys directly from the signature bytes, it is much faster than the python backend
+    from coincurve import PublicKey
+except ImportError:
+    PublicKey = None
+
+
+def get_header_fields(block):
+    """ Get the header fields for signing and the signature of the block, they are rlp encoded and hashed by get_header_data
+    The hash fields of the block are bytes already, they are used without any hex conversion
+    """
+    extra_data = block.extraData
+    raw_data = [bytes(block.parentHash),
+                bytes.fromhex(block.miner[2:]),
+                bytes(block.stateRoot),
+                bytes(block.transactionsRoot),
+                bytes(block.receiptsRoot),
+                bytes(block.logsBloom),
+                block.number,
+                block.gasLimit,
+                block.gasUsed,
+                block.timestamp,
+                bytes(extra_data[:32]),
+                bytes(block.nonce),
+                ]
+    return raw_data, bytes(extra_data[32:])
+
+
+def get_header_data(block):
+    """ Get the hash for signing and the signature of the block header
+    """
+    raw_data, sign = get_header_fields(block)
+    return keccak(rlp.encode(raw_data)), sign
+
+
+def get_rlp_header_data(raw_data):
+    """ Get the hash for signing and the signature from the rlp encoded header or block, such as the result of debug_getBlockRlp
+    """
+    if type(raw_data) is str:
+        raw_data = bytes.fromhex(raw_data[2:] if raw_data.startswith('0x') else raw_data)
+
+    header = rlp.decode(raw_data)
+    # The first item of an encoded block is the header
+    if type(header[0]) is list:
+        header = header[0]
+
+    extra_data = header[10]
+    header[10] = extra_data[:32]
+    return keccak(rlp.encode(header)), extra_data[32:]
+
+
+def recover_node_id(header_hash, sign):
+    """ Recover the node public key that signed the block header
+    """
+    v = sign[64]
+    standard_sign = sign[:64] + bytes([v - 27 if v >= 27 else v])
+
+    if PublicKey:
+        public_key = PublicKey.from_signature_and_message(standard_sign, header_hash, hasher=None)
+        return public_key.format(compressed=False)[1:].hex()
+
+    signature = Signature(signature_bytes=standard_sign)
+    return signature.recover_public_key_from_msg_hash(header_hash).to_bytes().hex()
+
+
+def recover_node_ids(headers):
+    """ Recover the node public keys of a list of (header hash, signature), the key of an unrecoverable header is None
+    It is used as the task of process pool
+    """
+    node_ids = []
+    for header_hash, sign in headers:
+        try:
+            node_ids.append(recover_node_id(header_hash, sign))
+        except Exception:
+            node_ids.append(None)
+
+    return node_ids
+
+
+def recover_header_fields(headers):
+    """ Recover the node public keys of a list of (header fields, signature), see get_header_fields
+    It is used as the task of process pool, so that the headers are hashed in the worker processes too
+    """
+    return recover_node_ids([(keccak(rlp.encode(raw_data)), sign) for raw_data, sign in headers])
+
+
+def recover_headers(headers):
+    """ Recover the node public keys of a batch of headers, each header is a block or its rlp encoded data
+    """
+    return recover_node_ids([get_rlp_header_data(header) if isinstance(header, (bytes, str)) else get_header_data(header)
+                             for header in headers])
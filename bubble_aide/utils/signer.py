@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from eth_account import Account
+
+# Accounts loaded in the worker process, keyed by address
+_worker_accounts = {}
+
+
+def _init_worker(private_keys):
+    for private_key in private_keys:
+        account = Account.from_key(private_key)
+        _worker_accounts[account.address] = account
+
+
+def _sign_transactions(txns):
+    raw_transactions = []
+    for txn in txns:
+        try:
+            account = _worker_accounts[txn['from']]
+            raw_transactions.append(bytes(account.sign_transaction(txn).rawTransaction))
+        except Exception as e:
+            raw_transactions.append(e)
+
+    return raw_transactions
+
+
+class ProcessSigner:
+    """ Sign transactions in a process pool, the private keys are loaded once in each worker process
+    The transactions are signed by the account of their from address, and the raw transactions are returned in order
+    """
+
+    def __init__(self, private_keys, processes: int = None, chunksize: int = 256):
+        """
+        Args:
+            private_keys: Private keys of all accounts to be signed
+            processes: Number of worker processes, default is the number of cpus
+            chunksize: Number of transactions sent to a worker process at a time
+        """
+        self.addresses = {Account.from_key(private_key).address for private_key in private_keys}
+        self.processes = processes or os.cpu_count()
+        self.chunksize = chunksize
+        self.executor = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(list(private_keys),))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def sign_transactions(self, txns):
+        """ Sign the transactions and return the raw transactions in order, the result of a failed signature is its exception
+        """
+        txns = list(txns)
+        # Spread small batches over all worker processes
+        chunksize = max(min(self.chunksize, -(-len(txns) // self.processes)), 1)
+        chunks = [txns[i:i + chunksize] for i in range(0, len(txns), chunksize)]
+        raw_transactions = []
+        for chunk in self.executor.map(_sign_transactions, chunks):
+            raw_transactions.extend(chunk)
+
+        return raw_transactions
+
+    def close(self):
+        self.executor.shutdown()
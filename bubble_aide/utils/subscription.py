@@ -0,0 +1,103 @@
+import json
+import socket
+import time
+from typing import TYPE_CHECKING
+
+try:
+    from websockets.exceptions import WebSocketException
+    from websockets.sync.client import connect as ws_connect
+except ImportError:
+    WebSocketException = ()
+    ws_connect = None
+
+if TYPE_CHECKING:
+    from bubble_aide import Aide
+
+subscribe_request = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'bub_subscribe', 'params': ['newHeads']})
+
+
+class HeadSubscription:
+    """ Subscribe to new block heads through the newHeads subscription of ws or ipc connection
+    A dedicated connection is used, so that the notifications do not interfere with the requests of the provider
+    """
+
+    def __init__(self, aide: "Aide"):
+        self.aide = aide
+        self._ws = None
+        self._sock = None
+        self._buffer = ''
+        self._decoder = json.JSONDecoder()
+
+        try:
+            if aide.uri.startswith('ws'):
+                self._ws = ws_connect(aide.uri)
+                self._ws.send(subscribe_request)
+            else:
+                self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._sock.connect(str(aide.web3.provider.ipc_path))
+                self._sock.sendall(subscribe_request.encode('utf-8'))
+        except Exception as e:
+            self.close()
+            raise ConnectionError(f'connect for subscription failed: {e}') from e
+
+    @staticmethod
+    def supported(uri):
+        """ Whether the uri supports subscription
+        """
+        return (uri.startswith('ws') and ws_connect is not None) or uri.startswith('ipc')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def next(self, timeout=None):
+        """ Wait for the next block head and return its block number, raise TimeoutError if no head arrives in time
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError('wait block head timeout!')
+
+            message = self._receive(remaining)
+            if message.get('error'):
+                raise ConnectionError(f'subscribe new heads failed: {message["error"]}')
+
+            head = message.get('params', {}).get('result')
+            if message.get('method') == 'bub_subscription' and head:
+                return int(head['number'], 16)
+
+    def _receive(self, timeout):
+        if self._ws:
+            try:
+                return json.loads(self._ws.recv(timeout))
+            except WebSocketException as e:
+                # Closed or broken connection, let the watcher fall back to polling
+                raise ConnectionError(f'websocket connection is broken: {e}') from e
+
+        # The ipc stream is a sequence of json objects
+        while True:
+            self._buffer = self._buffer.lstrip()
+            try:
+                message, index = self._decoder.raw_decode(self._buffer)
+                self._buffer = self._buffer[index:]
+                return message
+            except ValueError:
+                pass
+
+            self._sock.settimeout(timeout)
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                raise TimeoutError('wait block head timeout!')
+            if not data:
+                raise ConnectionError('ipc connection closed')
+            self._buffer += data.decode('utf-8')
+
+    def close(self):
+        if self._ws:
+            self._ws.close()
+        if self._sock:
+            self._sock.close()
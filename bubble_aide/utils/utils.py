@@ -1,17 +1,29 @@
 import functools
+import itertools
 import json
 import os
 import sys
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, asdict
 from os.path import abspath
 from typing import cast
 
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from bubble import Web3, HTTPProvider, WebsocketProvider, IPCProvider
+from bubble._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
+from bubble._utils.request import make_post_request
 from bubble._utils.threads import Timeout
 from bubble.datastructures import AttributeDict
 from bubble.exceptions import ContractLogicError
 from bubble.middleware import node_poa_middleware
 from bubble.types import RLPEventData
+from eth_account import Account
+from eth_utils import remove_0x_prefix
 
 from gql import Client
 from gql.transport.aiohttp import AIOHTTPTransport
@@ -32,11 +44,91 @@ precompile_contracts = [
 ]
 
 
-def get_web3(uri, timeout=10, modules=None):
+@dataclass(frozen=True)
+class PoolConfig:
+    """ Connection pool configuration of the http provider
+    """
+    pool_size: int = 10  # Maximum number of connections kept for the node
+    pool_block: bool = False  # Whether to wait for a free connection when the pool is exhausted
+    keep_alive: bool = True
+    connect_timeout: float = 10
+    read_timeout: float = 30
+    retries: int = 0  # Number of retries on connection errors and retry_status responses
+    backoff_factor: float = 0.3  # Sleep backoff_factor * (2 ** (retry - 1)) seconds between retries
+    retry_status: tuple = (502, 503, 504)
+
+
+class SessionHTTPProvider(HTTPProvider):
+    """ Http provider which sends the requests of all threads through its session
+    HTTPProvider only caches the given session for the thread that creates it, requests from other threads would use new default sessions
+    """
+
+    def __init__(self, endpoint_uri, session: Session, request_kwargs=None):
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs, session=session)
+        self.session = session
+
+    def post(self, data):
+        """ Post the encoded request data to the node, and return the raw response
+        """
+        response = self.session.post(self.endpoint_uri, data=data, **dict(self.get_request_kwargs()))
+        response.raise_for_status()
+        return response.content
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        return self.decode_rpc_response(self.post(request_data))
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(uri, pool: PoolConfig = None):
+    """ Get the http session of the uri, Aide with the same uri and pool configuration share one session
+    """
+    pool = pool or PoolConfig()
+    with _sessions_lock:
+        session = _sessions.get((uri, pool))
+        if session:
+            return session
+
+        retry = Retry(total=pool.retries,
+                      backoff_factor=pool.backoff_factor,
+                      status_forcelist=pool.retry_status,
+                      allowed_methods=None,  # Json rpc requests are all POST
+                      raise_on_status=False,
+                      )
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=pool.pool_size,
+                              pool_block=pool.pool_block,
+                              max_retries=retry,
+                              )
+        session = Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not pool.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        _sessions[(uri, pool)] = session
+        return session
+
+
+def get_web3(uri, timeout=10, modules=None, pool: PoolConfig = None, session: Session = None, check_connection=True):
     """ Obtain web3 objects through rpc uri
+
+    Args:
+        uri: RPC links open to nodes
+        timeout: Seconds to wait for the node to be connected
+        modules: Web3 modules
+        pool: Connection pool configuration, only for http uri
+        session: Http session to use, it takes precedence over the session created by the pool configuration
+        check_connection: Whether to wait for the node to be connected
     """
     if uri.startswith('http'):
-        provider = HTTPProvider
+        pool = pool or PoolConfig()
+        session = session or get_session(uri, pool)
+        request_kwargs = {'timeout': (pool.connect_timeout, pool.read_timeout)}
+        provider = functools.partial(SessionHTTPProvider, session=session, request_kwargs=request_kwargs)
     elif uri.startswith('ws'):
         provider = WebsocketProvider
     elif uri.startswith('ipc'):
@@ -44,6 +136,9 @@ def get_web3(uri, timeout=10, modules=None):
     else:
         raise ValueError(f'unidentifiable uri {uri}')
 
+    if not check_connection:
+        return Web3(provider(uri), modules=modules)
+
     with Timeout(timeout) as t:
         while True:
             web3 = Web3(provider(uri), modules=modules)
@@ -54,20 +149,182 @@ def get_web3(uri, timeout=10, modules=None):
     return web3
 
 
+def make_batch_request(web3, requests):
+    """ Send rpc requests in one json-rpc batch, and return the responses in the order of requests
+    Providers other than http do not support batch, the requests will be sent one by one
+
+    Args:
+        web3: Web3 object
+        requests: List of (method, params)
+    """
+    provider = web3.provider
+    if not isinstance(provider, HTTPProvider):
+        return [provider.make_request(method, params) for method, params in requests]
+
+    payload = [{'jsonrpc': '2.0', 'method': method, 'params': params, 'id': i}
+               for i, (method, params) in enumerate(requests)]
+    data = FriendlyJsonSerde().json_encode(payload, cls=Web3JsonEncoder).encode('utf-8')
+    if isinstance(provider, SessionHTTPProvider):
+        raw_response = provider.post(data)
+    else:
+        raw_response = make_post_request(provider.endpoint_uri, data, **dict(provider.get_request_kwargs()))
+    responses = FriendlyJsonSerde().json_decode(raw_response.decode('utf-8'))
+
+    # The node returns a single error response when it rejects the whole batch
+    if type(responses) is not list:
+        raise ValueError(f'batch request failed: {responses}')
+
+    responses = {response['id']: response for response in responses}
+    return [responses.get(i, {'error': 'missing response'}) for i in range(len(requests))]
+
+
+@functools.lru_cache(maxsize=256)
+def get_account(private_key):
+    """ Derive the account of the private key, the derived accounts are cached to avoid repeated key derivation
+    """
+    return Account.from_key(private_key)
+
+
+economic_cache_dir = os.path.join(os.path.expanduser('~'), '.bubble_aide', 'economic')
+
+
 def get_economic(aide):
     """ To obtain economic model data from a node, the node needs to open the debug interface
+    If aide.economic_cache is set, the data is cached in the directory by chain id and genesis hash,
+    and it is refreshed only when a parameter proposal has ended since it was cached
+    """
+    cache_dir = getattr(aide, 'economic_cache', None)
+    if not cache_dir:
+        return fetch_economic(aide)
+
+    # Get the cache key and the parameter proposals in one batch request
+    try:
+        with aide.batch() as batch:
+            batch.add(getattr, aide.bub, 'chain_id')
+            batch.add(aide.bub.get_block, 0)
+            batch.add(getattr, aide.bub, 'block_number')
+            batch.add(get_param_proposals, aide)
+        error = next((result for result in batch.results if isinstance(result, Exception)), None)
+    except Exception as e:
+        # The node rejects json-rpc batch, or the request fails
+        error = e
+
+    if error:
+        warnings.warn(f'cannot check the economic cache: {error}')
+        return fetch_economic(aide)
+
+    chain_id, genesis_block, block_number, proposals = batch.results
+    path = os.path.join(cache_dir, f'{chain_id}_{remove_0x_prefix(genesis_block.hash.hex())}.json')
+
+    cache = load_json(path)
+    if cache:
+        economic = new_economic(cache['economic'])
+        ended_proposals = [proposal for proposal in proposals
+                           if cache['block_number'] < proposal['EndVotingBlock'] <= block_number]
+        if not ended_proposals:
+            return economic
+
+        economic = fetch_economic(aide, warn=False) or update_economic_params(aide, economic, ended_proposals)
+    else:
+        economic = fetch_economic(aide)
+
+    if economic:
+        dump_json(path, {'block_number': block_number, 'economic': asdict(economic)})
+
+    return economic
+
+
+def fetch_economic(aide, warn=True):
+    """ Obtain economic model data through the debug interface of the node
     """
     data = ''
     try:
         data = aide.debug.economic_config()
     except IOError:
-        warnings.warn('The debug api is not open, cannot get the economic data automatically')
+        if warn:
+            warnings.warn('The debug api is not open, cannot get the economic data automatically')
 
     economic = new_economic(data) if data else None
 
     return economic
 
 
+def get_param_proposals(aide):
+    """ Obtain all parameter proposals on the chain
+    """
+    proposal_list = aide.web3.proposal.proposal_list().call()
+    if proposal_list == 'Object not found':
+        return []
+
+    return [proposal for proposal in proposal_list if proposal['ProposalType'] == 3]
+
+
+def update_economic_params(aide, economic, proposals):
+    """ Update the governable parameters modified by the proposals into the economic data
+    """
+    for proposal in proposals:
+        module, name = proposal['Module'], proposal['Name']
+        section = getattr(economic, module, None)
+        if not hasattr(section, name):
+            continue
+
+        value = aide.web3.proposal.get_govern_param(module, name).call()
+        try:
+            setattr(section, name, int(value))
+        except (TypeError, ValueError):
+            warnings.warn(f'unrecognized govern param {module}.{name}: {value}')
+
+    economic.refresh()
+    return economic
+
+
+def load_json(path):
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def dump_json(path, data):
+    """ Write json file atomically, so that concurrent processes never read a partial file
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        warnings.warn(f'cannot write file {path}: {e}')
+
+
+def iter_concurrently(func, items, max_workers=8, max_pending=None):
+    """ Run func over items in a thread pool, and yield (item, result) in the order of completion
+    Items are consumed lazily and at most max_pending tasks are in flight, so the memory is bounded for endless items.
+    The result of a failed task is its exception.
+    """
+    max_pending = max_pending or max_workers * 2
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = {}
+        while True:
+            for item in itertools.islice(items, max_pending - len(pending)):
+                pending[executor.submit(func, item)] = item
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, error if error else future.result()
+
+
 def get_gql(uri):
     """ Obtain the gql object through the gql uri.
     """
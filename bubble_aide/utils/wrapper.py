@@ -1,6 +1,7 @@
-import copy
 import functools
 
+from bubble_aide.utils.utils import get_account
+
 
 def contract_transaction(fid=None, default_txn=None):
     """ Built in contract trading decorator, accepts additional parameters
@@ -9,26 +10,26 @@ def contract_transaction(fid=None, default_txn=None):
     def decorator(func):
 
         @functools.wraps(func)
-        def wrapper(self, *args, txn: dict = None, private_key=None, **kwargs):
-            # txn = txn or {}
-            if txn:
-                txn = copy.deepcopy(txn)
-            else:
-                txn = {}
+        def wrapper(self, *args, txn: dict = None, private_key=None, result_type=None, **kwargs):
+            # The transaction fields are flat, a shallow copy is enough to keep the caller's txn unchanged
+            txn = dict(txn) if txn else {}
             if default_txn:
                 txn.update(default_txn)
 
             # Fill in the from address to prevent contract transactions from failing to verify the address when estimating gas
             if not txn.get('from'):
-                account = self.aide.bub.account.from_key(private_key) if private_key else self.aide.account
+                account = get_account(private_key) if private_key else self.aide.account
                 if account:
                     txn['from'] = account.address
 
             contract_function = func(self, *args, private_key=private_key, **kwargs)
             txn = contract_function.build_transaction(txn)
 
-            return self.aide.send_transaction(txn, fid=fid, private_key=private_key)
+            return self.aide.send_transaction(txn, fid=fid, result_type=result_type, private_key=private_key)
 
+        # Mark the transaction method, so that the async module can wait for its receipt without blocking
+        wrapper.fid = fid
+        wrapper.is_transaction = True
         return wrapper
 
     return decorator
@@ -14,7 +14,13 @@ deps = {
         'eth_utils>=2.1.0',
         'rlp>=3.0.0',
         'gql>=3.0.0rc0',
-    ]
+    ],
+    'analysis': [
+        'numpy>=1.20.0',
+    ],
+    'speedups': [
+        'coincurve>=17.0.0',
+    ],
 }
 
 with open('./README.md', encoding='utf-8') as readme:
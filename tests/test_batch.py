@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bubble_aide.statics import batch as batch_module
+from bubble_aide.statics.batch import Batch, batch_middleware
+
+
+@pytest.fixture
+def node(monkeypatch):
+    """ Fake node answering 'double' requests, and recording every batch request
+    """
+    requests = []
+
+    def make_batch_request(web3, batch_requests):
+        requests.append(batch_requests)
+        return [params[0] * 2 for _, params in batch_requests]
+
+    def make_request(method, params):
+        raise AssertionError(f'request {method} is not batched')
+
+    monkeypatch.setattr(batch_module, 'make_batch_request', make_batch_request)
+    aide = SimpleNamespace(web3=object())
+    aide.request = batch_middleware(make_request, aide.web3)
+    return SimpleNamespace(aide=aide, requests=requests)
+
+
+def test_results_in_order(node):
+    with Batch(node.aide) as batch:
+        for i in range(5):
+            batch.add(node.aide.request, 'double', [i])
+
+    assert batch.results == [0, 2, 4, 6, 8]
+    assert len(node.requests) == 1
+
+
+def test_dependent_requests_take_rounds(node):
+    def chained(value):
+        return node.aide.request('double', [node.aide.request('double', [value])])
+
+    with Batch(node.aide) as batch:
+        batch.add(chained, 1)
+        batch.add(chained, 2)
+
+    assert batch.results == [4, 8]
+    assert len(node.requests) == 2
+
+
+def test_failed_call_keeps_its_exception(node):
+    def fail():
+        node.aide.request('double', [1])
+        raise KeyError('bad')
+
+    with Batch(node.aide) as batch:
+        batch.add(node.aide.request, 'double', [1])
+        batch.add(fail)
+
+    assert batch.results[0] == 2
+    assert isinstance(batch.results[1], KeyError)
+
+
+def test_too_many_rounds(node):
+    def endless():
+        value = 1
+        while True:
+            value = node.aide.request('double', [value])
+
+    with Batch(node.aide, max_rounds=2) as batch:
+        batch.add(endless)
+
+    assert isinstance(batch.results[0], RuntimeError)
+
+
+def test_nested_batch_restores_outer(node):
+    def nested():
+        with Batch(node.aide) as inner:
+            inner.add(node.aide.request, 'double', [10])
+        return inner.results[0] + node.aide.request('double', [1])
+
+    with Batch(node.aide) as batch:
+        batch.add(nested)
+
+    assert batch.results == [22]
+    assert batch_module._local.batch is None
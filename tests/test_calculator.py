@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bubble_aide.statics.calculator import Calculator
+from bubble_aide.statics.economic import period_types
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def calculator():
+    period_table = {'round': 10, 'consensus': 40, 'epoch': 160, 'increasing': 1600}
+    return Calculator(SimpleNamespace(economic=SimpleNamespace(period_table=period_table)))
+
+
+@pytest.mark.parametrize('period_type', period_types)
+def test_periods_info_matches_period_info(calculator, period_type):
+    block_numbers = [0, 1, 9, 10, 11, 39, 40, 41, 159, 160, 161, 1599, 1600, 1601, 123456]
+    periods, start_blocks, end_blocks = calculator.get_periods_info(block_numbers, period_type)
+
+    for i, block_number in enumerate(block_numbers):
+        # get_period_info takes block number 0 as the current block, so period 1 is expected directly
+        expected = calculator.get_period_info(block_number or 1, period_type)
+        assert (periods[i], start_blocks[i], end_blocks[i]) == expected
+
+
+def test_periods_info_unknown_type(calculator):
+    with pytest.raises(ValueError):
+        calculator.get_periods_info([1], 'year')
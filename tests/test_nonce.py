@@ -0,0 +1,57 @@
+import threading
+from types import SimpleNamespace
+
+from bubble_aide.statics.nonce import NonceManager
+
+
+class FakeBub:
+
+    def __init__(self, count):
+        self.count = count
+        self.requests = 0
+
+    def get_transaction_count(self, address, block_identifier):
+        self.requests += 1
+        return self.count
+
+
+def make_manager(count=5):
+    bub = FakeBub(count)
+    return NonceManager(SimpleNamespace(bub=bub)), bub
+
+
+def test_nonces_are_consecutive():
+    manager, bub = make_manager()
+    assert [manager.get_nonce('a') for _ in range(3)] == [5, 6, 7]
+    assert bub.requests == 1
+
+
+def test_peek_does_not_take():
+    manager, _ = make_manager()
+    assert manager.peek_nonce('a') == 5
+    assert manager.get_nonce('a') == 5
+    assert manager.peek_nonce('a') == 6
+
+
+def test_observe_and_reset():
+    manager, bub = make_manager()
+    manager.get_nonce('a')
+    manager.observe('a', 10)
+    assert manager.get_nonce('a') == 11
+
+    manager.reset('a')
+    bub.count = 8
+    assert manager.get_nonce('a') == 8
+
+
+def test_concurrent_nonces_are_unique():
+    manager, _ = make_manager(0)
+    nonces = []
+    threads = [threading.Thread(target=lambda: nonces.extend(manager.get_nonce('a') for _ in range(100)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(nonces) == list(range(800))
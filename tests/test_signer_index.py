@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from bubble_aide.statics.signer_index import SignerIndex
+
+
+@pytest.fixture
+def index():
+    index = SignerIndex(':memory:')
+    yield index
+    index.close()
+
+
+def test_missing_full_range(index):
+    index.put_many([(number, '0x11') for number in range(1, 101)])
+    assert index.missing(1, 100) == []
+    assert index.missing(90, 105) == [101, 102, 103, 104, 105]
+
+
+def test_missing_matches_brute_force():
+    rand = random.Random(1)
+    for _ in range(300):
+        index = SignerIndex(':memory:')
+        indexed = {number for number in range(60) if rand.random() < 0.6}
+        index.put_many([(number, '0x11') for number in indexed])
+        start_bn = rand.randint(0, 50)
+        end_bn = rand.randint(start_bn, 65)
+        assert index.missing(start_bn, end_bn) == [bn for bn in range(start_bn, end_bn + 1) if bn not in indexed]
+        index.close()
+
+
+def test_unrecoverable_blocks_are_not_counted(index):
+    index.put_many([(1, '0xAA'), (2, '0xaa'), (3, None), (4, '0xbb')])
+    assert index.missing(1, 4) == []
+    assert index.count_blocks('aa', 1, 4) == 2
+    assert index.get_block_counts(1, 4) == {'aa': 2, 'bb': 1}
+
+
+def test_genesis_hash_is_checked(tmp_path):
+    path = str(tmp_path / 'signers.db')
+    SignerIndex(path, '0xAB').close()
+    SignerIndex(path, '0xab').close()
+    with pytest.raises(ValueError):
+        SignerIndex(path, '0xcd')